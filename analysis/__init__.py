@@ -4,29 +4,45 @@ Advanced analytics for stocks and portfolios
 """
 
 from .stock_analyzer import (
+    RiskFactor,
+    RiskProfile,
     calculate_comprehensive_risk_profile,
+    calculate_comprehensive_risk_profile_vec,
     analyze_performance_context,
-    calculate_quality_metrics
+    calculate_quality_metrics,
+    calculate_quality_metrics_batch
 )
 
 from .portfolio_analyzer import (
     detect_market_regime,
-    generate_portfolio_optimization_insights
+    generate_portfolio_optimization_insights,
+    cache_portfolio_optimization_insights
 )
 
 from .insights_generator import (
     generate_comprehensive_analysis,
-    generate_market_regime_insights
+    generate_comprehensive_analysis_batch,
+    generate_market_regime_insights,
+    cache_comprehensive_analysis,
+    cache_market_regime_insights
 )
 
 __version__ = "1.0.0"
 
 __all__ = [
+    'RiskFactor',
+    'RiskProfile',
     'calculate_comprehensive_risk_profile',
+    'calculate_comprehensive_risk_profile_vec',
     'analyze_performance_context', 
     'calculate_quality_metrics',
+    'calculate_quality_metrics_batch',
     'detect_market_regime',
     'generate_portfolio_optimization_insights',
     'generate_comprehensive_analysis',
-    'generate_market_regime_insights'
+    'generate_comprehensive_analysis_batch',
+    'generate_market_regime_insights',
+    'cache_portfolio_optimization_insights',
+    'cache_comprehensive_analysis',
+    'cache_market_regime_insights'
 ]
@@ -3,92 +3,230 @@ Insights Generation Module
 Comprehensive analysis and narrative generation for stocks and portfolios
 """
 
+import numpy as np
+import streamlit as st
+
+from config.settings import (
+    EXCELLENT_SHARPE_THRESHOLD,
+    GOOD_SHARPE_THRESHOLD,
+    MODERATE_SHARPE_THRESHOLD
+)
 from .stock_analyzer import (
-    calculate_comprehensive_risk_profile,
-    analyze_performance_context,
-    calculate_quality_metrics
+    VOL_THRESHOLDS,
+    _band_index,
+    _has_market_context,
+    _pct,
+    _performance_context_arrays,
+    _quality_scores,
+    _round_scores,
+    _risk_profile_arrays,
+    _risk_profile_from_scalars,
+    _performance_context_from_scalars,
+    _quality_metrics_from_scalars
 )
 from .portfolio_analyzer import detect_market_regime
+from data.cache_manager import _results_file_signature
 
+# Summary columns read by the analysis, with the defaults the analyzers use
+METRIC_DEFAULTS = (
+    ('total_return', 0),
+    ('volatility_21', 0),
+    ('avg_sharpe_21', 0),
+    ('avg_rolling_yield_21', 0),
+    ('avg_max_drawdown_63', 0),
+    ('avg_custom_risk_score', 0.01)
+)
 
-def generate_comprehensive_analysis(symbol, data, portfolio_context):
-    """Generate comprehensive, objective stock analysis - guaranteed insights"""
-    insights = []
+# Narrative band tables: ascending bounds, one label per band (lowest first).
+# Percent fields arrive preformatted by _pct.
+PERFORMANCE_THRESHOLDS = np.array([-0.10, 0, 0.05, 0.20])
+PERF_TEMPLATES = (
+    "📉 **Performance**: {sym} experienced significant decline of {x}",
+    "📉 **Performance**: {sym} declined {x} during the period",
+    "📊 **Performance**: {sym} posted modest {x} returns",
+    "📈 **Performance**: {sym} gained {x} over the analysis period",
+    "🚀 **Performance**: {sym} generated strong {x} returns during the selected period"
+)
+
+TREND_TEMPLATES = (
+    "📉 **Trend**: Daily average decline of {abs_x} projects to {annualized} annualized",
+    "📊 **Trend**: Flat trend with minimal daily movement averaging {x}",
+    "📈 **Trend**: Daily average return of {x} projects to {annualized} annualized"
+)
+
+EFFICIENCY_THRESHOLDS = np.array([MODERATE_SHARPE_THRESHOLD, GOOD_SHARPE_THRESHOLD, EXCELLENT_SHARPE_THRESHOLD])
+EFFICIENCY_LABELS = (
+    ('⚠️', 'Below-average'),
+    ('📊', 'Moderate'),
+    ('✅', 'Good'),
+    ('⭐', 'Excellent')
+)
+
+QUALITY_THRESHOLDS = np.array([50, 70])
+QUALITY_LABELS = (
+    ('📊', 'Below-average'),
+    ('📊', 'Moderate'),
+    ('🏆', 'High')
+)
+
+RISK_CATEGORIES = ('low-risk', 'moderate-risk', 'high-risk')
+RETURN_CATEGORY_THRESHOLDS = np.array([0, 0.05, 0.15])
+RETURN_CATEGORIES = ('negative returns', 'modest gains', 'moderate gains', 'strong gains')
+
+
+def generate_comprehensive_analysis(symbol, data, portfolio_context,
+                                    _risk=_risk_profile_from_scalars,
+                                    _ctx=_performance_context_from_scalars,
+                                    _qual=_quality_metrics_from_scalars,
+                                    _band=_band_index):
+    """Generate comprehensive, objective stock analysis - guaranteed insights
     
-    # Get all analysis components
-    risk_profile = calculate_comprehensive_risk_profile(symbol, data)
-    performance_context = analyze_performance_context(symbol, data, portfolio_context)
-    quality_metrics = calculate_quality_metrics(symbol, data)
+    The underscored keyword defaults bind the helpers at definition time
+    (LOAD_FAST instead of a global lookup per call); callers never pass them.
+    """
+    # Extract key metrics once and hand the scalars to the analyzers
+    total_return, volatility, sharpe_ratio, avg_return, max_drawdown, risk_score = (
+        float(data.get(key, default)) for key, default in METRIC_DEFAULTS
+    )
     
-    # Extract key metrics
-    total_return = data.get('total_return', 0)
-    volatility = data.get('volatility_21', 0)
-    sharpe_ratio = data.get('avg_sharpe_21', 0)
-    avg_return = data.get('avg_rolling_yield_21', 0)
+    # Get all analysis components (read-only here, so the cached results are used as-is)
+    risk_profile = _risk(volatility, max_drawdown, sharpe_ratio)
+    performance_context = _ctx(
+        symbol,
+        total_return,
+        volatility,
+        portfolio_context.get('avg_return', 0),
+        portfolio_context.get('avg_volatility', 0.05)
+    ) if _has_market_context(portfolio_context) else ()
+    quality_score = _qual(sharpe_ratio, risk_score, total_return, avg_return)['overall']
     
-    # 1. PERFORMANCE SUMMARY (Always included)
-    if total_return > 0.20:
-        insights.append(f"🚀 **Performance**: {symbol} generated strong {total_return:.1%} returns during the selected period")
-    elif total_return > 0.05:
-        insights.append(f"📈 **Performance**: {symbol} gained {total_return:.1%} over the analysis period")
-    elif total_return > 0:
-        insights.append(f"📊 **Performance**: {symbol} posted modest {total_return:.1%} returns")
-    elif total_return > -0.10:
-        insights.append(f"📉 **Performance**: {symbol} declined {abs(total_return):.1%} during the period")
-    else:
-        insights.append(f"📉 **Performance**: {symbol} experienced significant decline of {abs(total_return):.1%}")
+    bands = (
+        _band(total_return, PERFORMANCE_THRESHOLDS),
+        _band(sharpe_ratio, EFFICIENCY_THRESHOLDS),
+        _trend_band(avg_return),
+        _band(quality_score, QUALITY_THRESHOLDS),
+        _band(volatility, VOL_THRESHOLDS),
+        _band(total_return, RETURN_CATEGORY_THRESHOLDS)
+    )
     
-    # 2. RISK ASSESSMENT (Always included)
-    volatility_info = risk_profile['volatility']
-    insights.append(f"📊 **Risk Profile**: {volatility_info['description']}")
+    numbers = (
+        _pct(abs(total_return)),
+        f'{sharpe_ratio:.2f}',
+        _pct(avg_return, 3),
+        _pct(abs(avg_return), 3),
+        _pct(abs(avg_return * 252))
+    )
     
-    # 3. EFFICIENCY ANALYSIS (Always included)
-    if sharpe_ratio > 1.2:
-        insights.append(f"⭐ **Efficiency**: Excellent risk-adjusted performance with Sharpe ratio of {sharpe_ratio:.2f}")
-    elif sharpe_ratio > 0.8:
-        insights.append(f"✅ **Efficiency**: Good risk-adjusted performance with Sharpe ratio of {sharpe_ratio:.2f}")
-    elif sharpe_ratio > 0.3:
-        insights.append(f"📊 **Efficiency**: Moderate risk-adjusted performance with Sharpe ratio of {sharpe_ratio:.2f}")
-    else:
-        insights.append(f"⚠️ **Efficiency**: Below-average risk-adjusted performance with Sharpe ratio of {sharpe_ratio:.2f}")
+    return _compose_insights(
+        symbol, numbers, quality_score,
+        risk_profile.volatility.description, risk_profile.drawdown.description,
+        performance_context, bands
+    )
+
+
+def generate_comprehensive_analysis_batch(summary_data, portfolio_context):
+    """Generate comprehensive analysis for every row of a summary DataFrame
     
-    # 4. TREND ANALYSIS (Always included)
-    if avg_return > 0.001:
-        annualized_trend = avg_return * 252
-        insights.append(f"📈 **Trend**: Daily average return of {avg_return:.3%} projects to {annualized_trend:.1%} annualized")
-    elif avg_return < -0.001:
-        annualized_trend = avg_return * 252
-        insights.append(f"📉 **Trend**: Daily average decline of {abs(avg_return):.3%} projects to {abs(annualized_trend):.1%} annualized")
-    else:
-        insights.append(f"📊 **Trend**: Flat trend with minimal daily movement averaging {avg_return:.3%}")
+    All bands are classified for the whole frame up front with vectorized
+    lookups, so only string assembly runs per row. Returns one insight list
+    per row, in row order.
+    """
+    n = len(summary_data)
+    total_return, volatility, sharpe_ratio, avg_return, max_drawdown, risk_score = (
+        summary_data[key].to_numpy(dtype=float) if key in summary_data else np.full(n, default, dtype=float)
+        for key, default in METRIC_DEFAULTS
+    )
+    # round() per element, as the scalar path does, so bands and printed scores match it
+    quality_score = _round_scores(_quality_scores(sharpe_ratio, risk_score, total_return, avg_return)[3])
     
-    # 5. QUALITY METRICS (Always included)  
-    if quality_metrics['overall'] > 70:
-        insights.append(f"🏆 **Quality Score**: High rating of {quality_metrics['overall']}/100 across key metrics")
-    elif quality_metrics['overall'] > 50:
-        insights.append(f"📊 **Quality Score**: Moderate rating of {quality_metrics['overall']}/100 across key metrics")
-    else:
-        insights.append(f"📊 **Quality Score**: Below-average rating of {quality_metrics['overall']}/100 across key metrics")
+    bands = zip(
+        _band_index(total_return, PERFORMANCE_THRESHOLDS).tolist(),
+        _band_index(sharpe_ratio, EFFICIENCY_THRESHOLDS).tolist(),
+        _trend_band(avg_return).tolist(),
+        _band_index(quality_score, QUALITY_THRESHOLDS).tolist(),
+        _band_index(volatility, VOL_THRESHOLDS).tolist(),
+        _band_index(total_return, RETURN_CATEGORY_THRESHOLDS).tolist()
+    )
+    risk_profile = _risk_profile_arrays(volatility, max_drawdown, sharpe_ratio)
     
-    # 6. CONTEXT INSIGHTS (if available)
-    insights.extend(performance_context)
+    # Number-to-text for the whole frame at once (same text as _pct / '.2f')
+    numbers = zip(
+        np.char.mod('%.1f%%', np.abs(total_return) * 100).tolist(),
+        np.char.mod('%.2f', sharpe_ratio).tolist(),
+        np.char.mod('%.3f%%', avg_return * 100).tolist(),
+        np.char.mod('%.3f%%', np.abs(avg_return) * 100).tolist(),
+        np.char.mod('%.1f%%', np.abs(avg_return * 252) * 100).tolist()
+    )
     
-    # 7. DRAWDOWN ANALYSIS (Always included)
-    drawdown_info = risk_profile['drawdown']
-    insights.append(f"📊 **Downside Risk**: {drawdown_info['description']}")
+    symbols = summary_data['symbol'].tolist()
+    if _has_market_context(portfolio_context):
+        contexts = _performance_context_arrays(
+            symbols, total_return, volatility,
+            portfolio_context.get('avg_return', 0), portfolio_context.get('avg_volatility', 0.05)
+        )
+    else:
+        contexts = [()] * n
     
-    # 8. FINAL FACTUAL SUMMARY (Always included)
-    risk_category = "high-risk" if volatility > 0.08 else "moderate-risk" if volatility > 0.05 else "low-risk"
-    return_category = "strong gains" if total_return > 0.15 else "moderate gains" if total_return > 0.05 else "modest gains" if total_return > 0 else "negative returns"
+    # Single formatting pass over the aligned per-row values
+    rows = zip(
+        symbols, numbers, quality_score.tolist(),
+        risk_profile['vol_desc'], risk_profile['drawdown_desc'], contexts, bands
+    )
+    return [
+        _compose_insights(symbol, row_numbers, quality, vol_desc, drawdown_desc, performance_context, row_bands)
+        for symbol, row_numbers, quality, vol_desc, drawdown_desc, performance_context, row_bands in rows
+    ]
+
+
+def _trend_band(avg_return):
+    """0 = declining, 1 = flat, 2 = rising (NaN counts as flat)"""
+    return np.select([avg_return > 0.001, avg_return < -0.001], [2, 0], default=1)
+
+
+def _compose_insights(symbol, numbers, quality_score,
+                      volatility_description, drawdown_description, performance_context, bands):
+    """Assemble the narrative for one stock from preformatted numbers and precomputed band indices
     
-    insights.append(f"📋 **Profile**: {symbol} is a {risk_category} stock showing {return_category} over your selected timeframe")
+    numbers is (|total return|, Sharpe, daily return, |daily return|, |annualized return|) as text.
+    """
+    total_return_text, sharpe_text, daily_text, abs_daily_text, annualized_text = numbers
+    perf_band, efficiency_band, trend_band, quality_band, risk_band, return_band = bands
+    efficiency_emoji, efficiency_label = EFFICIENCY_LABELS[efficiency_band]
+    quality_emoji, quality_label = QUALITY_LABELS[quality_band]
+    risk_category = RISK_CATEGORIES[risk_band]
+    return_category = RETURN_CATEGORIES[return_band]
     
-    return insights
+    # Built as a single list display so the result is sized once
+    return [
+        # 1. PERFORMANCE SUMMARY (Always included)
+        PERF_TEMPLATES[perf_band].format(sym=symbol, x=total_return_text),
+        
+        # 2. RISK ASSESSMENT (Always included)
+        f"📊 **Risk Profile**: {volatility_description}",
+        
+        # 3. EFFICIENCY ANALYSIS (Always included)
+        f"{efficiency_emoji} **Efficiency**: {efficiency_label} risk-adjusted performance with Sharpe ratio of {sharpe_text}",
+        
+        # 4. TREND ANALYSIS (Always included)
+        TREND_TEMPLATES[trend_band].format(x=daily_text, abs_x=abs_daily_text, annualized=annualized_text),
+        
+        # 5. QUALITY METRICS (Always included)
+        f"{quality_emoji} **Quality Score**: {quality_label} rating of {quality_score}/100 across key metrics",
+        
+        # 6. CONTEXT INSIGHTS (if available)
+        *performance_context,
+        
+        # 7. DRAWDOWN ANALYSIS (Always included)
+        f"📊 **Downside Risk**: {drawdown_description}",
+        
+        # 8. FINAL FACTUAL SUMMARY (Always included)
+        f"📋 **Profile**: {symbol} is a {risk_category} stock showing {return_category} over your selected timeframe",
+    ]
 
 
-def generate_market_regime_insights(summary_data):
+def generate_market_regime_insights(summary_data, _detect=detect_market_regime):
     """Generate market regime analysis"""
-    regime = detect_market_regime(summary_data)
+    regime = _detect(summary_data)
     insights = []
     
     insights.append(f"🌐 **Market Regime**: {regime['regime']} detected with {regime['confidence'].lower()} confidence")
@@ -105,3 +243,27 @@ def generate_market_regime_insights(summary_data):
         insights.append("💡 **Market Context**: Mixed environment suggests selective, balanced approach")
     
     return insights
+
+
+@st.cache_data
+def _cached_comprehensive_analysis(_summary_data, symbols_key, date_key, portfolio_context, file_signature):
+    """Per-stock narratives memoized on what produced the summary, plus the (small) context dict"""
+    return generate_comprehensive_analysis_batch(_summary_data, portfolio_context)
+
+
+def cache_comprehensive_analysis(_summary_data, symbols_key, date_key, portfolio_context):
+    """Cached per-stock insight lists, one per summary row, keyed like the summary they read"""
+    return _cached_comprehensive_analysis(
+        _summary_data, symbols_key, date_key, portfolio_context, _results_file_signature()
+    )
+
+
+@st.cache_data
+def _cached_market_regime_insights(_summary_data, symbols_key, date_key, file_signature):
+    """Regime insights memoized on what produced the summary (the frame itself is not hashed)"""
+    return generate_market_regime_insights(_summary_data)
+
+
+def cache_market_regime_insights(_summary_data, symbols_key, date_key):
+    """Cached market regime insights, keyed like the summary they read"""
+    return _cached_market_regime_insights(_summary_data, symbols_key, date_key, _results_file_signature())
@@ -3,16 +3,50 @@ Portfolio-Level Analysis Module
 Market regime detection and portfolio optimization insights
 """
 
+from functools import lru_cache
+
+import numpy as np
+import streamlit as st
+
+from data.cache_manager import _results_file_signature
+
 
 def detect_market_regime(portfolio_data):
     """Detect current market regime with confidence levels"""
-    positive_stocks = (portfolio_data['total_return'] > 0).sum()
-    total_stocks = len(portfolio_data)
-    avg_volatility = portfolio_data['volatility_21'].mean()
-    avg_return = portfolio_data['total_return'].mean()
+    positive_ratio, avg_return, avg_volatility = _regime_stats(
+        portfolio_data['total_return'].to_numpy(dtype=float),
+        portfolio_data['volatility_21'].to_numpy(dtype=float)
+    )
+    
+    # Copy so callers can't corrupt the cached entry
+    return dict(_classify_regime(positive_ratio, avg_return, avg_volatility))
+
+
+def _regime_stats(total_return, volatility):
+    """Positive ratio and NaN-skipping mean return/volatility from raw arrays
     
-    positive_ratio = positive_stocks / total_stocks
+    Works on plain ndarrays so per-slice callers skip the Series overhead.
+    """
+    total_stocks = total_return.shape[0]
+    if total_stocks == 0:
+        # Nothing selected: NaN statistics, which classify as the neutral regime
+        return float('nan'), float('nan'), float('nan')
     
+    positive_stocks = np.count_nonzero(total_return > 0)
+    avg_return = np.nanmean(total_return)
+    avg_volatility = np.nanmean(volatility)
+    
+    # Plain Python floats: cheaper to hash as _classify_regime cache keys
+    return positive_stocks / total_stocks, float(avg_return), float(avg_volatility)
+
+
+@lru_cache(maxsize=128)
+def _classify_regime(positive_ratio, avg_return, avg_volatility):
+    """Regime dict for a set of portfolio statistics (memoized)
+    
+    The statistics are the cache key: they are as cheap to compute as any
+    digest of the columns and fully determine the result.
+    """
     if positive_ratio > 0.7 and avg_return > 0.1:
         return {
             'regime': 'Bull Market', 
@@ -43,14 +77,43 @@ def detect_market_regime(portfolio_data):
         }
 
 
+def _top_k_indices(values, k, largest=True):
+    """Positions nlargest/nsmallest(k, keep='first') would pick, best first
+    
+    Ties keep row order, and NaN rows (in row order) fill the list when fewer
+    than k values are present.
+    """
+    keys = -values if largest else values
+    present = ~np.isnan(keys)
+    candidates = np.flatnonzero(present)  # row order
+    
+    # O(N) partial selection: keep everything up to the k-th best, ties at the
+    # boundary included, so only the survivors get sorted
+    if k < candidates.size:
+        kth = np.partition(keys[candidates], k - 1)[k - 1]
+        candidates = candidates[keys[candidates] <= kth]
+    
+    # Stable sort over row-ordered positions: tied values stay first-come
+    ranked = candidates[np.argsort(keys[candidates], kind='stable')][:k]
+    if ranked.size < k:
+        ranked = np.concatenate([ranked, np.flatnonzero(~present)[:k - ranked.size]])
+    return ranked
+
+
+def _topk_symbols(summary_data, column, k, largest=True):
+    """Symbols of the k best rows by one column, without copying whole rows"""
+    positions = _top_k_indices(summary_data[column].to_numpy(dtype=float), k, largest)
+    return summary_data['symbol'].to_numpy()[positions].tolist()
+
+
 def generate_portfolio_optimization_insights(summary_data):
     """Generate objective portfolio construction insights - educational only"""
     insights = []
     
     # Top performers by different metrics (FACTUAL REPORTING)
-    top_sharpe = summary_data.nlargest(3, 'avg_sharpe_21')['symbol'].tolist()
-    top_return = summary_data.nlargest(3, 'total_return')['symbol'].tolist()
-    low_risk = summary_data.nsmallest(3, 'avg_custom_risk_score')['symbol'].tolist()
+    top_sharpe = _topk_symbols(summary_data, 'avg_sharpe_21', 3)
+    top_return = _topk_symbols(summary_data, 'total_return', 3)
+    low_risk = _topk_symbols(summary_data, 'avg_custom_risk_score', 3, largest=False)
     
     # CHANGED: More objective language
     insights.append(f"📊 **Highest Risk-Adjusted Returns**: {', '.join(top_sharpe)} show the best Sharpe ratios in your selection")
@@ -58,7 +121,11 @@ def generate_portfolio_optimization_insights(summary_data):
     insights.append(f"📉 **Most Stable**: {', '.join(low_risk)} exhibit the lowest volatility patterns")
     
     # Risk distribution analysis (FACTUAL)
-    high_risk_count = (summary_data['avg_custom_risk_score'] > 0.08).sum()
+    if 'risk_category' in summary_data.columns:
+        # Code 2 is 'high' (low/moderate/high buckets from the summary loader)
+        high_risk_count = np.count_nonzero(summary_data['risk_category'].cat.codes.to_numpy() == 2)
+    else:
+        high_risk_count = np.count_nonzero(summary_data['avg_custom_risk_score'].to_numpy() > 0.08)
     total_count = len(summary_data)
     risk_percentage = (high_risk_count / total_count) * 100
     
@@ -70,3 +137,14 @@ def generate_portfolio_optimization_insights(summary_data):
         insights.append(f"🛡️ **Risk Distribution**: All selected stocks show moderate to low risk characteristics")
     
     return insights
+
+
+@st.cache_data
+def _cached_portfolio_optimization_insights(_summary_data, symbols_key, date_key, file_signature):
+    """Composition insights memoized on what produced the summary (the frame itself is not hashed)"""
+    return generate_portfolio_optimization_insights(_summary_data)
+
+
+def cache_portfolio_optimization_insights(_summary_data, symbols_key, date_key):
+    """Cached portfolio composition insights, keyed like the summary they read"""
+    return _cached_portfolio_optimization_insights(_summary_data, symbols_key, date_key, _results_file_signature())
@@ -3,59 +3,167 @@ Individual Stock Analysis Module
 Risk assessment, performance context, and quality metrics for individual stocks
 """
 
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
 from config.settings import (
-    HIGH_RISK_THRESHOLD,
-    MODERATE_RISK_THRESHOLD,
-    EXCELLENT_SHARPE_THRESHOLD,
-    GOOD_SHARPE_THRESHOLD,
-    MODERATE_SHARPE_THRESHOLD
+    HIGH_VOLATILITY_THRESHOLD,
+    MODERATE_VOLATILITY_THRESHOLD
 )
 
 
+# Repeated renders of the same symbol hit these caches instead of recomputing
+ANALYZER_CACHE_SIZE = 1024
+
+# Band tables for the risk profile: ascending bounds, one entry per band
+VOL_THRESHOLDS = np.array([MODERATE_VOLATILITY_THRESHOLD, HIGH_VOLATILITY_THRESHOLD])
+VOL_LEVELS = ('Low', 'Moderate', 'High')
+VOL_SCORES = (1, 2, 3)
+VOL_DESC = ('Relatively stable price movements', 'Moderate price fluctuations', 'Significant price swings')
+
+DRAWDOWN_THRESHOLDS = np.array([0.10, 0.20])
+DRAWDOWN_LEVELS = ('Low', 'Moderate', 'High')
+DRAWDOWN_SCORES = (1, 2, 3)
+DRAWDOWN_DESC = ('Limited downside risk', 'Moderate downside exposure', 'Large peak-to-trough declines')
+
+# Consistency bands are "below" tests, so higher Sharpe lands in the lower-risk band
+CONSISTENCY_THRESHOLDS = np.array([0.5, 1.0])
+CONSISTENCY_LEVELS = ('High', 'Moderate', 'Low')
+CONSISTENCY_SCORES = (3, 2, 1)
+CONSISTENCY_DESC = ('Inconsistent return patterns', 'Moderately consistent returns', 'Consistent return generation')
+
+
+@lru_cache(maxsize=ANALYZER_CACHE_SIZE)
+def _pct(x, digits=1):
+    """Percent string for a ratio - same text as f'{x:.{digits}%}', memoized per value"""
+    return f'{x * 100:.{digits}f}%'
+
+
+def _band_index(values, bounds, side='left'):
+    """Locate values within ascending bounds - table lookup in place of if/elif ladders
+    
+    side='left' counts bounds strictly below the value (``value > bound`` tests),
+    side='right' counts bounds at or below it (``value < bound`` tests inverted).
+    """
+    idx = np.searchsorted(bounds, values, side=side)
+    if side == 'left':
+        # NaN fails every '>' test, so it belongs in the bottom band
+        idx = np.where(np.isnan(values), 0, idx)
+    return idx
+
+
+def _bucketize(values, cuts, labels, scores, side='left'):
+    """Band index, level label and score for every value, in one vectorized lookup"""
+    idx = _band_index(values, cuts, side)
+    return idx, np.take(labels, idx), np.take(scores, idx)
+
+
+@dataclass(slots=True, frozen=True)
+class RiskFactor:
+    """One dimension of a risk profile"""
+    level: str
+    score: int
+    description: str
+
+
+@dataclass(slots=True, frozen=True)
+class RiskProfile:
+    """Volatility, drawdown and consistency risk for a single stock"""
+    volatility: RiskFactor
+    drawdown: RiskFactor
+    consistency: RiskFactor
+
+
 def calculate_comprehensive_risk_profile(symbol, data):
     """Calculate a comprehensive risk assessment"""
-    risk_factors = {}
+    return _risk_profile_from_scalars(
+        data.get('volatility_21', 0),
+        data.get('avg_max_drawdown_63', 0),
+        data.get('avg_sharpe_21', 0)
+    )
+
+
+@lru_cache(maxsize=ANALYZER_CACHE_SIZE)
+def _risk_profile_from_scalars(volatility, max_drawdown, sharpe):
+    """Risk profile keyed only on the metrics it reads (memoized; the result is immutable)"""
+    # 1. Volatility Risk
+    i = _band_index(volatility, VOL_THRESHOLDS)
+    volatility_risk = RiskFactor(VOL_LEVELS[i], VOL_SCORES[i], f'{VOL_DESC[i]} ({volatility:.1%} volatility)')
+    
+    # 2. Drawdown Risk
+    i = _band_index(max_drawdown, DRAWDOWN_THRESHOLDS)
+    drawdown_risk = RiskFactor(DRAWDOWN_LEVELS[i], DRAWDOWN_SCORES[i], f'{DRAWDOWN_DESC[i]} ({max_drawdown:.1%})')
+    
+    # 3. Consistency Risk
+    i = _band_index(sharpe, CONSISTENCY_THRESHOLDS, side='right')
+    consistency_risk = RiskFactor(CONSISTENCY_LEVELS[i], CONSISTENCY_SCORES[i], f'{CONSISTENCY_DESC[i]} (Sharpe: {sharpe:.2f})')
+    
+    return RiskProfile(volatility=volatility_risk, drawdown=drawdown_risk, consistency=consistency_risk)
+
+
+def calculate_comprehensive_risk_profile_vec(summary_data):
+    """Risk profile for every row of a summary DataFrame, one column per field"""
+    columns = _risk_profile_arrays(
+        summary_data['volatility_21'].to_numpy(dtype=float),
+        summary_data['avg_max_drawdown_63'].to_numpy(dtype=float),
+        summary_data['avg_sharpe_21'].to_numpy(dtype=float)
+    )
+    return pd.DataFrame(columns, index=summary_data.index)
+
+
+def _risk_profile_arrays(volatility, max_drawdown, sharpe):
+    """Column-wise twin of _risk_profile_from_scalars over aligned arrays"""
+    columns = {}
     
     # 1. Volatility Risk
-    volatility = data.get('volatility_21', 0)
-    if volatility > 0.08:
-        risk_factors['volatility'] = {'level': 'High', 'score': 3, 'description': f'Significant price swings ({volatility:.1%} volatility)'}
-    elif volatility > 0.05:
-        risk_factors['volatility'] = {'level': 'Moderate', 'score': 2, 'description': f'Moderate price fluctuations ({volatility:.1%} volatility)'}
-    else:
-        risk_factors['volatility'] = {'level': 'Low', 'score': 1, 'description': f'Relatively stable price movements ({volatility:.1%} volatility)'}
+    i, columns['vol_level'], columns['vol_score'] = _bucketize(volatility, VOL_THRESHOLDS, VOL_LEVELS, VOL_SCORES)
+    columns['vol_desc'] = [f'{VOL_DESC[b]} ({_pct(v)} volatility)' for b, v in zip(i.tolist(), volatility.tolist())]
     
     # 2. Drawdown Risk
-    max_drawdown = data.get('avg_max_drawdown_63', 0)
-    if max_drawdown > 0.20:
-        risk_factors['drawdown'] = {'level': 'High', 'score': 3, 'description': f'Large peak-to-trough declines ({max_drawdown:.1%})'}
-    elif max_drawdown > 0.10:
-        risk_factors['drawdown'] = {'level': 'Moderate', 'score': 2, 'description': f'Moderate downside exposure ({max_drawdown:.1%})'}
-    else:
-        risk_factors['drawdown'] = {'level': 'Low', 'score': 1, 'description': f'Limited downside risk ({max_drawdown:.1%})'}
+    i, columns['drawdown_level'], columns['drawdown_score'] = _bucketize(
+        max_drawdown, DRAWDOWN_THRESHOLDS, DRAWDOWN_LEVELS, DRAWDOWN_SCORES
+    )
+    columns['drawdown_desc'] = [f'{DRAWDOWN_DESC[b]} ({_pct(v)})' for b, v in zip(i.tolist(), max_drawdown.tolist())]
     
     # 3. Consistency Risk
-    sharpe = data.get('avg_sharpe_21', 0)
-    if sharpe < 0.5:
-        risk_factors['consistency'] = {'level': 'High', 'score': 3, 'description': f'Inconsistent return patterns (Sharpe: {sharpe:.2f})'}
-    elif sharpe < 1.0:
-        risk_factors['consistency'] = {'level': 'Moderate', 'score': 2, 'description': f'Moderately consistent returns (Sharpe: {sharpe:.2f})'}
-    else:
-        risk_factors['consistency'] = {'level': 'Low', 'score': 1, 'description': f'Consistent return generation (Sharpe: {sharpe:.2f})'}
+    i, columns['consistency_level'], columns['consistency_score'] = _bucketize(
+        sharpe, CONSISTENCY_THRESHOLDS, CONSISTENCY_LEVELS, CONSISTENCY_SCORES, side='right'
+    )
+    columns['consistency_desc'] = [f'{CONSISTENCY_DESC[b]} (Sharpe: {v:.2f})' for b, v in zip(i.tolist(), sharpe.tolist())]
     
-    return risk_factors
+    return columns
+
+
+def _has_market_context(portfolio_context):
+    """Whether the portfolio context carries any market average to compare against"""
+    return bool(portfolio_context) and (
+        'avg_return' in portfolio_context or 'avg_volatility' in portfolio_context
+    )
 
 
 def analyze_performance_context(symbol, data, portfolio_context):
     """Analyze performance in context of market and peers"""
-    insights = []
-    
-    total_return = data.get('total_return', 0)
-    symbol_volatility = data.get('volatility_21', 0)
+    # Without market averages the comparisons would run against placeholder defaults
+    if not _has_market_context(portfolio_context):
+        return []
     
-    # Market context
-    market_avg = portfolio_context.get('avg_return', 0)
-    market_volatility = portfolio_context.get('avg_volatility', 0.05)
+    insights = _performance_context_from_scalars(
+        symbol,
+        data.get('total_return', 0),
+        data.get('volatility_21', 0),
+        portfolio_context.get('avg_return', 0),
+        portfolio_context.get('avg_volatility', 0.05)
+    )
+    return list(insights)
+
+
+@lru_cache(maxsize=ANALYZER_CACHE_SIZE)
+def _performance_context_from_scalars(symbol, total_return, symbol_volatility, market_avg, market_volatility):
+    """Context insights keyed on the symbol, its metrics and the market averages (memoized)"""
+    insights = []
     
     # Relative performance analysis
     relative_performance = total_return - market_avg
@@ -75,36 +183,130 @@ def analyze_performance_context(symbol, data, portfolio_context):
             f"⚠️ **Risk-Return Mismatch**: {symbol} shows higher risk ({symbol_volatility:.1%}) than average but lower returns ({total_return:.1%})"
         )
     
-    return insights
+    return tuple(insights)
 
 
-def calculate_quality_metrics(symbol, data):
-    """Calculate objective quality metrics (0-100 scale)"""
-    metrics = {}
+def _performance_context_arrays(symbols, total_return, volatility, market_avg, market_volatility):
+    """Column-wise twin of _performance_context_from_scalars: one tuple of insights per row
+    
+    The comparisons run over whole arrays; only rows that qualify are formatted.
+    """
+    relative_performance = total_return - market_avg
+    relative = np.abs(relative_performance) > 0.05  # 5% difference is significant
+    efficient = (volatility < market_volatility * 0.8) & (total_return > market_avg)
+    mismatch = ~efficient & (volatility > market_volatility * 1.2) & (total_return < market_avg)
     
+    contexts = [()] * len(symbols)
+    for i in np.flatnonzero(relative | efficient | mismatch).tolist():
+        symbol, tr, vol = symbols[i], total_return[i], volatility[i]
+        insights = []
+        if relative[i]:
+            direction = "outperformed" if relative_performance[i] > 0 else "underperformed"
+            insights.append(
+                f"📊 **Relative Performance**: {symbol} {direction} your selection average by {_pct(abs(relative_performance[i]))}"
+            )
+        if efficient[i]:
+            insights.append(
+                f"🎯 **Risk Efficiency**: {symbol} achieved above-average returns ({_pct(tr)}) with below-average risk ({_pct(vol)})"
+            )
+        elif mismatch[i]:
+            insights.append(
+                f"⚠️ **Risk-Return Mismatch**: {symbol} shows higher risk ({_pct(vol)}) than average but lower returns ({_pct(tr)})"
+            )
+        contexts[i] = tuple(insights)
+    
+    return contexts
+
+
+def _quality_scores(sharpe, risk_score, total_return, avg_return):
+    """Quality sub-scores on scalars or aligned arrays
+    
+    fmax/fmin mirror the builtin max(0, x)/min(100, x) pair, so NaN inputs
+    score 0 instead of propagating.
+    """
     # Consistency Score (based on Sharpe ratio)
-    sharpe = data.get('avg_sharpe_21', 0)
-    consistency_score = min(100, max(0, (sharpe + 1) * 40))  # Normalize to 0-100
+    consistency_score = np.fmin(100, np.fmax(0, (sharpe + 1) * 40))  # Normalize to 0-100
     
     # Efficiency Score (return per unit of risk)
-    risk_score = data.get('avg_custom_risk_score', 0.01)
-    total_return = data.get('total_return', 0)
-    if risk_score > 0:
-        efficiency_score = min(100, max(0, (total_return / risk_score) * 5))
-    else:
-        efficiency_score = 0
+    has_risk = risk_score > 0
+    safe_risk = np.where(has_risk, risk_score, 1)
+    efficiency_score = np.where(has_risk, np.fmin(100, np.fmax(0, (total_return / safe_risk) * 5)), 0)
     
     # Growth Score (annualized return potential)
-    avg_return = data.get('avg_rolling_yield_21', 0)
     annualized_return = avg_return * 252
-    growth_score = min(100, max(0, (annualized_return + 0.1) * 200))  # Normalize
+    growth_score = np.fmin(100, np.fmax(0, (annualized_return + 0.1) * 200))  # Normalize
     
     # Overall score (weighted average)
     overall_score = (consistency_score * 0.4 + efficiency_score * 0.4 + growth_score * 0.2)
     
+    return consistency_score, efficiency_score, growth_score, overall_score
+
+
+def _quality_kernel(sharpe, risk_score, total_return, avg_return):
+    """Scalar twin of _quality_scores in plain float arithmetic
+    
+    Plain float math avoids building NumPy arrays (and dispatching ufuncs)
+    just to score a single symbol.
+    """
+    consistency_score = min(100.0, max(0.0, (sharpe + 1.0) * 40.0))
+    if risk_score > 0:
+        efficiency_score = min(100.0, max(0.0, (total_return / risk_score) * 5.0))
+    else:
+        efficiency_score = 0.0
+    growth_score = min(100.0, max(0.0, (avg_return * 252.0 + 0.1) * 200.0))
+    overall_score = consistency_score * 0.4 + efficiency_score * 0.4 + growth_score * 0.2
+    
+    return consistency_score, efficiency_score, growth_score, overall_score
+
+
+def calculate_quality_metrics(symbol, data):
+    """Calculate objective quality metrics (0-100 scale)"""
+    quality_metrics = _quality_metrics_from_scalars(
+        float(data.get('avg_sharpe_21', 0)),
+        float(data.get('avg_custom_risk_score', 0.01)),
+        float(data.get('total_return', 0)),
+        float(data.get('avg_rolling_yield_21', 0))
+    )
+    return dict(quality_metrics)
+
+
+@lru_cache(maxsize=ANALYZER_CACHE_SIZE)
+def _quality_metrics_from_scalars(sharpe, risk_score, total_return, avg_return):
+    """Rounded quality metrics keyed on the four inputs (memoized)"""
+    consistency_score, efficiency_score, growth_score, overall_score = _quality_kernel(
+        sharpe, risk_score, total_return, avg_return
+    )
+    
     return {
         'consistency': round(consistency_score, 1),
         'efficiency': round(efficiency_score, 1),
         'growth': round(growth_score, 1),
         'overall': round(overall_score, 1)
     }
+
+
+def _round_scores(values, ndigits=1):
+    """Round each score with Python round(), exactly as the scalar path does
+    
+    np.round scales by 10**ndigits before rounding, which can land a near-tie
+    on the other side of it; per-element round() keeps batch and per-row
+    scores identical.
+    """
+    return np.array([round(value, ndigits) for value in values.tolist()], dtype=float)
+
+
+def calculate_quality_metrics_batch(summary_data):
+    """Calculate quality metrics for every row of a summary DataFrame at once"""
+    consistency_score, efficiency_score, growth_score, overall_score = _quality_scores(
+        summary_data['avg_sharpe_21'].to_numpy(),
+        summary_data['avg_custom_risk_score'].to_numpy(),
+        summary_data['total_return'].to_numpy(),
+        summary_data['avg_rolling_yield_21'].to_numpy()
+    )
+    
+    return pd.DataFrame({
+        'consistency': _round_scores(consistency_score),
+        'efficiency': _round_scores(efficiency_score),
+        'growth': _round_scores(growth_score),
+        'overall': _round_scores(overall_score)
+    }, index=summary_data.index)
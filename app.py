@@ -1,3 +1,4 @@
+import heapq
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -10,8 +11,13 @@ pipeline = None
 
 from config.constants import (
     CUSTOM_CSS, 
-    SYMBOL_TO_NAME_MAPPING, 
-    SECTOR_MAPPING, 
+    STARFIELD_CSS,
+    HEADER_HTML,
+    METRIC_CARD_TEMPLATE,
+    SECTION_HEADER_TEMPLATE,
+    BASKET_ITEM_TEMPLATE,
+    PORTFOLIO_STATUS_TEMPLATE,
+    SYMBOL_TO_DISPLAY_NAME,
     QUICK_CATEGORIES,
     DEFAULT_SELECTED_SECTORS,
     ITEMS_PER_PAGE
@@ -29,24 +35,28 @@ from config.settings import (
 from data.cache_manager import (
     cache_data_loading,
     cache_symbol_processing, 
+    cache_symbol_search_index,
+    cache_symbol_selection,
+    cache_period_selection,
     cache_statistics_calculation
 )
+from data.processor import get_sector_mapping, get_available_symbols
 
 from analysis import (
     calculate_comprehensive_risk_profile,
     analyze_performance_context,
     calculate_quality_metrics,
     detect_market_regime,
-    generate_comprehensive_analysis,
-    generate_market_regime_insights,
-    generate_portfolio_optimization_insights
+    cache_comprehensive_analysis,
+    cache_market_regime_insights,
+    cache_portfolio_optimization_insights
 )
 
 from visualization.charts import (
-    create_risk_return_scatter,
-    create_performance_chart,
-    create_portfolio_metrics_chart,
-    create_correlation_heatmap
+    cache_risk_return_scatter,
+    cache_performance_chart,
+    cache_portfolio_metrics_chart,
+    cache_correlation_heatmap
 )
 
 # Page configuration
@@ -57,74 +67,52 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+# Base styles plus the starfield theme of the stock picker, sent as one message per run
+st.markdown(CUSTOM_CSS + STARFIELD_CSS, unsafe_allow_html=True)
 
 def create_header():
     """Create an enhanced, more appealing header section"""
-    st.markdown("""
-    <div class="main-header">
-        <div class="header-content">
-            <div class="logo-section">
-                <span class="logo-icon">🐂</span>
-                <div class="logo-text">
-                    <h1>BullBoard</h1>
-                    <div class="tagline">Professional Stock Analysis Made Simple</div>
-                </div>
-            </div>
-            <div class="value-props">
-                <div class="prop-item">
-                    <span class="prop-icon">📊</span>
-                    <span class="prop-text">Objective Data</span>
-                </div>
-                <div class="prop-item">
-                    <span class="prop-icon">🎯</span>
-                    <span class="prop-text">Clear Insights</span>
-                </div>
-                <div class="prop-item">
-                    <span class="prop-icon">⚡</span>
-                    <span class="prop-text">Real-time Analysis</span>
-                </div>
-            </div>
-        </div>
-        <div class="header-subtitle">
-            Objective insights for informed decision-making • No advice, just facts
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-def create_metric_card(title, value, subtitle="", icon="📊"):
-    """Create a metric card using Streamlit components with custom styling"""
-    
-    st.markdown(f"""
-    <div class="metric-card">
-        <div class="metric-header">
-            <span class="metric-icon">{icon}</span>
-            <span class="metric-title">{title}</span>
-        </div>
-        <div class="metric-value">{value}</div>
-        <div class="metric-subtitle">{subtitle}</div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Return empty string to prevent "None" from appearing
-    return ""
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
+
+def section_header(icon, title):
+    """Markup for a section title bar"""
+    return SECTION_HEADER_TEMPLATE.format(icon=icon, title=title)
+
+def render_section_header(icon, title):
+    """Render a section title bar on its own"""
+    st.markdown(section_header(icon, title), unsafe_allow_html=True)
+
+def render_metric_grid(cards, header="", footer=""):
+    """Render a row of metric cards (dicts of title/value/subtitle/icon) in one markdown call
+    
+    Optional header/footer markup (e.g. the section title) rides in the same message.
+    """
+    html = ''.join(METRIC_CARD_TEMPLATE.format_map(card) for card in cards)
+    st.markdown(f'{header}<div class="metric-grid">{html}</div>{footer}', unsafe_allow_html=True)
+
+# printf spec and scale per summary column (scale 100 renders fractions as percents)
+SUMMARY_DISPLAY_FORMATS = {
+    'total_return': ('%.2f%%', 100),
+    'avg_daily_return': ('%.4f%%', 100),
+    'avg_rolling_yield_21': ('%.4f%%', 100),
+    'volatility_21': ('%.4f', 1),
+    'avg_sharpe_21': ('%.2f', 1),
+    'avg_custom_risk_score': ('%.4f', 1),
+    'avg_close': ('$%.2f', 1),
+}
+
+def _format_column(values, spec, scale=1):
+    """Format a numeric column in one vectorized pass, "N/A" where missing"""
+    values = values.to_numpy(dtype=float)
+    return np.where(np.isnan(values), "N/A", np.char.mod(spec, values * scale))
 
 def create_enhanced_stock_selection(unique_symbols):
-    """Create enhanced stock selection with sector filtering"""
-    sector_mapping = SECTOR_MAPPING
-    
-    # Create reverse mapping for symbols not in defined sectors
-    symbol_to_sector = {}
-    for sector, symbols in sector_mapping.items():
-        for symbol in symbols:
-            symbol_to_sector[symbol] = sector
-    
-    # Add "Other" category for symbols not in predefined sectors
-    other_symbols = [sym for sym in unique_symbols if sym not in symbol_to_sector]
-    if other_symbols:
-        sector_mapping['Other'] = other_symbols
-        for sym in other_symbols:
-            symbol_to_sector[sym] = 'Other'
+    """Create enhanced stock selection with sector filtering
+    
+    Not rendered: main() uses create_user_friendly_stock_selection.
+    """
+    # Predefined sectors plus "Other"
+    sector_mapping = get_sector_mapping(unique_symbols)
     
     # Sector filter UI
     col1, col2 = st.columns([3, 1])
@@ -142,16 +130,8 @@ def create_enhanced_stock_selection(unique_symbols):
             selected_sectors = list(sector_mapping.keys())
             st.rerun()
     
-    # Get filtered symbols based on selected sectors
-    filtered_symbols = []
-    for sector in selected_sectors:
-        if sector in sector_mapping:
-            filtered_symbols.extend(sector_mapping[sector])
-    
-    # Remove duplicates and filter to only available symbols
-    filtered_symbols = list(set(filtered_symbols))
-    available_symbols = [sym for sym in filtered_symbols if sym in unique_symbols]
-    available_symbols.sort()
+    # Symbols of the selected sectors
+    available_symbols = get_available_symbols(selected_sectors, unique_symbols)
     
     # Stock selection
     col1, col2 = st.columns([3, 1])
@@ -176,142 +156,96 @@ def create_enhanced_stock_selection(unique_symbols):
     return selected_symbols
 
 
+def _add_to_basket(*symbols):
+    """Button callback: add symbols to the basket before the click's own rerun"""
+    basket = st.session_state.stock_basket
+    to_add = [symbol for symbol in symbols if symbol not in basket]
+    basket.update(dict.fromkeys(to_add, True))
+    if to_add:
+        label = to_add[0] if len(to_add) == 1 else f"{len(to_add)} stocks"
+        st.toast(f"Added {label}!")
+
+
+def _add_checked_categories(categories, unique_set):
+    """Form callback: add every ticked theme's (available) stocks"""
+    picked = [stocks for i, stocks in enumerate(categories.values()) if st.session_state.get(f"cat_{i}")]
+    # Themes overlap (e.g. NVDA), so dedupe the candidates first
+    candidates = dict.fromkeys(stock for stocks in picked for stock in stocks)
+    _add_to_basket(*(stock for stock in candidates if stock in unique_set))
+
+
+def _remove_from_basket():
+    """Button callback: drop the stock chosen in the remove picker"""
+    st.session_state.stock_basket.pop(st.session_state.get("remove_choice"), None)
+
+
+def _clear_basket():
+    """Button callback: empty the basket"""
+    st.session_state.stock_basket = {}
+
+
+def _add_selected_rows(table_key, symbols):
+    """Button callback: add the symbols of the rows ticked in a pick table"""
+    rows = st.session_state[table_key]["selection"]["rows"]
+    _add_to_basket(*(symbols[i] for i in rows if i < len(symbols)))
+
+
+def _render_pick_table(symbols, names, key):
+    """One selectable table of symbols plus one add button, instead of a widget row per symbol
+    
+    Callers vary the key with the listing (page, query) so a selection never
+    carries over to rows it wasn't made on.
+    """
+    st.dataframe(
+        pd.DataFrame({"Symbol": symbols, "Company": names}),
+        key=key,
+        on_select="rerun",
+        selection_mode="multi-row",
+        hide_index=True,
+        use_container_width=True
+    )
+    st.button("➕ Add Selected", key=f"{key}_add", on_click=_add_selected_rows, args=(key, tuple(symbols)))
+
+
+def _basket_markdown(symbols):
+    """Count line, stock rows and status badge for a basket"""
+    # Portfolio status
+    portfolio_size = len(symbols)
+    if portfolio_size <= 3:
+        status_color = "#ff9500"
+        status_text = "Small portfolio"
+        status_emoji = "🟡"
+    elif portfolio_size <= 6:
+        status_color = "#28a745"
+        status_text = "Good diversity"
+        status_emoji = "🟢"
+    else:
+        status_color = "#007bff"
+        status_text = "Well diversified"
+        status_emoji = "🔵"
+    
+    parts = [f"**{portfolio_size} stocks selected:**\n\n"]
+    parts.extend(
+        BASKET_ITEM_TEMPLATE.format(symbol=symbol, name=SYMBOL_TO_DISPLAY_NAME.get(symbol, symbol))
+        for symbol in symbols
+    )
+    parts.append(PORTFOLIO_STATUS_TEMPLATE.format(
+        color=status_color, emoji=status_emoji, size=portfolio_size, text=status_text
+    ))
+    return ''.join(parts)
+
+
 def create_user_friendly_stock_selection(unique_symbols):
     """Modern 2-column stock selection interface"""
     
     # Initialize session state for selection basket
+    # (a dict used as an insertion-ordered set: O(1) membership and removal)
     if 'stock_basket' not in st.session_state:
-        st.session_state.stock_basket = []
+        st.session_state.stock_basket = {}
     
-    symbol_to_name = SYMBOL_TO_NAME_MAPPING
+    unique_set = frozenset(unique_symbols)  # hashed membership for every check below
     
     st.markdown("---")
-    # Ultra-Sleek Financial Theme with Animated Starfield
-    st.markdown("""
-    <style>
-    .stApp {
-        background: 
-            radial-gradient(2px 2px at 20px 30px, rgba(255,255,255,0.15), transparent),
-            radial-gradient(2px 2px at 40px 70px, rgba(255,255,255,0.1), transparent),
-            radial-gradient(1px 1px at 90px 40px, rgba(255,255,255,0.1), transparent),
-            radial-gradient(1px 1px at 130px 80px, rgba(255,255,255,0.1), transparent),
-            radial-gradient(2px 2px at 160px 30px, rgba(255,255,255,0.1), transparent),
-            linear-gradient(135deg, #0c0c0c 0%, #1a1a2e 15%, #16213e 35%, #0f3460 55%, #533483 75%, #7b2d26 95%, #2c1810 100%) !important;
-        background-size: 
-            200px 100px,
-            300px 120px,
-            150px 200px,
-            250px 150px,
-            180px 90px,
-            100% 100% !important;
-        background-attachment: fixed !important;
-        animation: starfieldMove 25s linear infinite, gradientPulse 15s ease-in-out infinite !important;
-    }
-    
-    @keyframes starfieldMove {
-        0% {
-            background-position: 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0% 50%;
-        }
-        100% {
-            background-position: 200px 100px, -300px 120px, 150px -200px, -250px 150px, 180px -90px, 100% 50%;
-        }
-    }
-    
-    @keyframes gradientPulse {
-        0%, 100% {
-            background-position: 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0% 50%;
-        }
-        50% {
-            background-position: 100px 50px, 150px 60px, 75px 100px, 125px 75px, 90px 45px, 100% 50%;
-        }
-    }
-    
-    /* Enhanced text with subtle glow */
-    .stMarkdown, .stText, p, span {
-        color: #f8f9fa !important;
-        text-shadow: 0 0 10px rgba(248, 249, 250, 0.1) !important;
-    }
-    
-    h1, h2, h3, h4, h5, h6 {
-        color: #ffffff !important;
-        text-shadow: 0 0 15px rgba(255, 255, 255, 0.2) !important;
-    }
-    
-    /* Premium button styling with enhanced gradient */
-    .stButton > button {
-        background: linear-gradient(45deg, 
-            rgba(123, 45, 38, 0.9) 0%, 
-            rgba(83, 52, 131, 0.9) 25%, 
-            rgba(15, 52, 96, 0.9) 50%, 
-            rgba(83, 52, 131, 0.9) 75%, 
-            rgba(123, 45, 38, 0.9) 100%) !important;
-        background-size: 200% 200% !important;
-        color: white !important;
-        border: 1px solid rgba(255, 255, 255, 0.3) !important;
-        border-radius: 10px !important;
-        font-weight: bold !important;
-        box-shadow: 
-            0 4px 15px rgba(0, 0, 0, 0.3),
-            inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
-        transition: all 0.4s ease !important;
-        animation: buttonShimmer 3s ease-in-out infinite !important;
-    }
-    
-    @keyframes buttonShimmer {
-        0%, 100% {
-            background-position: 0% 50%;
-        }
-        50% {
-            background-position: 100% 50%;
-        }
-    }
-    
-    .stButton > button:hover {
-        background-position: 100% 50% !important;
-        transform: translateY(-2px) scale(1.02) !important;
-        box-shadow: 
-            0 8px 25px rgba(123, 45, 38, 0.4),
-            0 4px 15px rgba(83, 52, 131, 0.3),
-            inset 0 1px 0 rgba(255, 255, 255, 0.2) !important;
-        border-color: rgba(255, 255, 255, 0.5) !important;
-    }
-    
-    /* Sleek input styling with glow effects */
-    .stSelectbox > div > div,
-    .stTextInput > div > div > input {
-        background: rgba(255, 255, 255, 0.08) !important;
-        border: 1px solid rgba(255, 255, 255, 0.15) !important;
-        border-radius: 10px !important;
-        color: #f8f9fa !important;
-        backdrop-filter: blur(10px) !important;
-        box-shadow: 
-            inset 0 1px 3px rgba(0, 0, 0, 0.2),
-            0 1px 3px rgba(255, 255, 255, 0.1) !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    .stSelectbox > div > div:focus,
-    .stTextInput > div > div > input:focus {
-        border-color: rgba(123, 45, 38, 0.7) !important;
-        box-shadow: 
-            0 0 0 3px rgba(123, 45, 38, 0.15),
-            inset 0 1px 3px rgba(0, 0, 0, 0.2),
-            0 1px 8px rgba(123, 45, 38, 0.3) !important;
-        background: rgba(255, 255, 255, 0.12) !important;
-    }
-    
-    /* Enhanced metric containers */
-    div[data-testid="metric-container"] {
-        background: rgba(255, 255, 255, 0.05) !important;
-        border: 1px solid rgba(255, 255, 255, 0.1) !important;
-        border-radius: 12px !important;
-        backdrop-filter: blur(15px) !important;
-        box-shadow: 
-            0 8px 32px rgba(0, 0, 0, 0.3),
-            inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
 
     # Create a container specifically for the portfolio section
     st.markdown('<div class="portfolio-section">', unsafe_allow_html=True)
@@ -324,69 +258,27 @@ def create_user_friendly_stock_selection(unique_symbols):
         st.markdown("### 📊 Your Portfolio")
         
         if st.session_state.stock_basket:
-            st.write(f"**{len(st.session_state.stock_basket)} stocks selected:**")
+            # Count, stock rows and status go out as one markdown message, rebuilt
+            # only when the basket contents change (session_state outlives the
+            # rerun; a cache on this script's functions would not)
+            basket = tuple(st.session_state.stock_basket)
+            basket_hash = hash(basket)
+            if st.session_state.get('_last_basket_hash') != basket_hash:
+                st.session_state._last_basket_hash = basket_hash
+                st.session_state._last_portfolio_html = _basket_markdown(basket)
+            st.markdown(st.session_state._last_portfolio_html, unsafe_allow_html=True)
             
-            # Display stocks with white containers
-            for symbol in st.session_state.stock_basket:
-                company_name = symbol_to_name.get(symbol, symbol)
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.markdown(f"""
-                    <div style="
-                        background: rgba(255, 255, 255, 0.95);
-                        padding: 10px 15px;
-                        border-radius: 10px;
-                        color: #2d3436;
-                        font-weight: bold;
-                        margin: 5px 0;
-                        box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-                        border-left: 4px solid #4facfe;
-                    ">
-                    {symbol} - {company_name[:25]}{'...' if len(company_name) > 25 else ''}
-                    </div>
-                    """, unsafe_allow_html=True)
-                with col2:
-                    if st.button("❌", key=f"remove_{symbol}", help="Remove"):
-                        st.session_state.stock_basket.remove(symbol)
-                        st.rerun()
-            
-            # Portfolio status
-            portfolio_size = len(st.session_state.stock_basket)
-            if portfolio_size <= 3:
-                status_color = "#ff9500"
-                status_text = "Small portfolio"
-                status_emoji = "🟡"
-            elif portfolio_size <= 6:
-                status_color = "#28a745"
-                status_text = "Good diversity"
-                status_emoji = "🟢"
-            else:
-                status_color = "#007bff"
-                status_text = "Well diversified"
-                status_emoji = "🔵"
-            
-            st.markdown(f"""
-            <div style="
-                background: rgba(255, 255, 255, 0.95);
-                padding: 15px;
-                border-radius: 12px;
-                text-align: center;
-                color: {status_color};
-                font-weight: bold;
-                margin: 15px 0;
-                box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-                border: 2px solid {status_color};
-            ">
-            {status_emoji} {portfolio_size} stocks selected - {status_text}
-            </div>
-            """, unsafe_allow_html=True)
+            # One picker + button removes any stock
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.selectbox("Remove stock", list(st.session_state.stock_basket), key="remove_choice", label_visibility="collapsed")
+            with col2:
+                st.button("❌", key="remove_stock", help="Remove", on_click=_remove_from_basket)
             
             # Action buttons
             col1, col2 = st.columns(2)
             with col1:
-                if st.button("🗑️ Clear All", key="clear_basket"):
-                    st.session_state.stock_basket = []
-                    st.rerun()
+                st.button("🗑️ Clear All", key="clear_basket", on_click=_clear_basket)
             with col2:
                 st.markdown(f"""
                 <div style="
@@ -408,10 +300,8 @@ def create_user_friendly_stock_selection(unique_symbols):
             st.write("**Quick start suggestions:**")
             quick_add = ['AAPL', 'MSFT', 'GOOGL']
             for symbol in quick_add:
-                if symbol in unique_symbols:
-                    if st.button(f"+ Add {symbol}", key=f"quick_{symbol}"):
-                        st.session_state.stock_basket.append(symbol)
-                        st.rerun()
+                if symbol in unique_set:
+                    st.button(f"+ Add {symbol}", key=f"quick_{symbol}", on_click=_add_to_basket, args=(symbol,))
     
     # === RIGHT COLUMN: Stock Discovery ===
     with right_col:
@@ -429,35 +319,18 @@ def create_user_friendly_stock_selection(unique_symbols):
 
             categories = QUICK_CATEGORIES
             
-            # Category buttons in 2 columns
-            col1, col2 = st.columns(2, gap="medium")
-            category_items = list(categories.items())
-            
-            with col1:
-                for i in range(0, len(category_items), 2):
-                    category_name, stocks = category_items[i]
-                    if st.button(f"{category_name} ({len(stocks)})", key=f"cat_{i}", use_container_width=True):
-                        added_count = 0
-                        for stock in stocks:
-                            if stock in unique_symbols and stock not in st.session_state.stock_basket:
-                                st.session_state.stock_basket.append(stock)
-                                added_count += 1
-                        if added_count > 0:
-                            st.success(f"Added {added_count} stocks!")
-                            st.rerun()
-            
-            with col2:
-                for i in range(1, len(category_items), 2):
-                    category_name, stocks = category_items[i]
-                    if st.button(f"{category_name} ({len(stocks)})", key=f"cat_{i}", use_container_width=True):
-                        added_count = 0
-                        for stock in stocks:
-                            if stock in unique_symbols and stock not in st.session_state.stock_basket:
-                                st.session_state.stock_basket.append(stock)
-                                added_count += 1
-                        if added_count > 0:
-                            st.success(f"Added {added_count} stocks!")
-                            st.rerun()
+            # Ticking themes doesn't rerun the script; the form submits them all at once
+            with st.form("add_stocks_form", clear_on_submit=True, border=False):
+                # Category checkboxes in 2 columns (even-indexed left, odd-indexed right)
+                columns = st.columns(2, gap="medium")
+                for i, (category_name, stocks) in enumerate(categories.items()):
+                    with columns[i % 2]:
+                        st.checkbox(f"{category_name} ({len(stocks)})", key=f"cat_{i}")
+                
+                st.form_submit_button(
+                    "➕ Add Selected Themes", use_container_width=True,
+                    on_click=_add_checked_categories, args=(categories, unique_set)
+                )
             
             # Tip section
             st.markdown("""
@@ -472,7 +345,7 @@ def create_user_friendly_stock_selection(unique_symbols):
                 box-shadow: 0 2px 10px rgba(0,0,0,0.1);
                 border-left: 4px solid #fdcb6e;
             ">
-            💡 Tip: Click any category above to add all its stocks to your portfolio!
+            💡 Tip: Tick one or more themes above, then add all their stocks to your portfolio at once!
             </div>
             """, unsafe_allow_html=True)
         
@@ -486,38 +359,13 @@ def create_user_friendly_stock_selection(unique_symbols):
             )
             
             if search_term:
-                matches = []
-                search_lower = search_term.lower()
-                for symbol in unique_symbols:
-                    company_name = symbol_to_name.get(symbol, symbol)
-                    if (search_lower in symbol.lower() or 
-                        search_lower in company_name.lower()):
-                        matches.append((symbol, company_name))
+                # One vectorized substring test over ticker and name together
+                search_index = cache_symbol_search_index(unique_symbols)
+                hits = search_index[search_index['haystack'].str.contains(search_term.lower(), regex=False)]
                 
-                if matches:
-                    st.write(f"**Found {len(matches)} matches:**")
-                    
-                    for symbol, company_name in matches[:10]:
-                        col1, col2 = st.columns([3, 1])
-                        with col1:
-                            st.markdown(f"""
-                            <div style="
-                                background: rgba(255, 255, 255, 0.95);
-                                padding: 8px 12px;
-                                border-radius: 8px;
-                                color: #2d3436;
-                                margin: 5px 0;
-                                border-left: 3px solid #f093fb;
-                            ">
-                            <strong>{symbol}</strong> - {company_name}
-                            </div>
-                            """, unsafe_allow_html=True)
-                        with col2:
-                            if st.button("➕", key=f"add_{symbol}", help="Add"):
-                                if symbol not in st.session_state.stock_basket:
-                                    st.session_state.stock_basket.append(symbol)
-                                    st.success(f"Added {symbol}!")
-                                    st.rerun()
+                if not hits.empty:
+                    st.write(f"**Found {len(hits)} matches:**")
+                    _render_pick_table(hits['symbol'].tolist(), hits['name'].tolist(), f"search_results_{search_term.lower()}")
                 else:
                     st.warning("No matches found. Try a different search term.")
         
@@ -539,41 +387,20 @@ def create_user_friendly_stock_selection(unique_symbols):
             
             st.write(f"**Showing stocks {start_idx + 1}-{end_idx} of {total_items}:**")
             
-            for i in range(start_idx, end_idx):
-                symbol = unique_symbols[i]
-                company_name = symbol_to_name.get(symbol, symbol)
-                
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.markdown(f"""
-                    <div style="
-                        background: rgba(255, 255, 255, 0.95);
-                        padding: 8px 12px;
-                        border-radius: 8px;
-                        color: #2d3436;
-                        margin: 3px 0;
-                        border-left: 3px solid #f093fb;
-                    ">
-                    <strong>{symbol}</strong> - {company_name}
-                    </div>
-                    """, unsafe_allow_html=True)
-                with col2:
-                    if st.button("➕", key=f"browse_add_{symbol}", help="Add"):
-                        if symbol not in st.session_state.stock_basket:
-                            st.session_state.stock_basket.append(symbol)
-                            st.success(f"Added {symbol}!")
-                            st.rerun()
+            # Page rows sliced off the cached symbol/name table, no per-symbol lookups
+            page_rows = cache_symbol_search_index(unique_symbols).iloc[start_idx:end_idx]
+            _render_pick_table(page_rows['symbol'].tolist(), page_rows['name'].tolist(), f"browse_results_{page}")
 
     # Close the portfolio section container
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Return selection
     if st.session_state.stock_basket:
-        return st.session_state.stock_basket
+        return list(st.session_state.stock_basket)
     else:
         default_stocks = ['AAPL', 'MSFT', 'GOOGL']
-        available_defaults = [stock for stock in default_stocks if stock in unique_symbols]
-        return available_defaults[:3] if available_defaults else unique_symbols[:3]
+        available_defaults = [stock for stock in default_stocks if stock in unique_set]
+        return available_defaults[:3] if available_defaults else list(unique_symbols[:3])
 
 def main():
     create_header()
@@ -656,44 +483,34 @@ def main():
         st.stop()
     
    # Data info section with improved metric cards
-    st.markdown('<div class="section-header"><span class="section-icon">📊</span><h2>Market Overview</h2></div>', unsafe_allow_html=True)
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        create_metric_card("Stocks Analyzed", str(df['symbol'].nunique()), "Active Symbols", "🏢")
-    
-    with col2:
-        create_metric_card("Data Points", f"{len(df):,}", "Total Records", "📊")
-    
-    with col3:
-        if 'download_time' in df.columns and not df['download_time'].isna().all():
-            try:
-                last_update = pd.to_datetime(df['download_time'].iloc[0])
-                formatted_time = last_update.strftime("%H:%M")
-                create_metric_card("Last Update", formatted_time, "Today", "🕐")
-            except:
-                create_metric_card("Last Update", "Recent", "Data Fresh", "🕐")
-        else:
-            create_metric_card("Last Update", "Recent", "Data Fresh", "🕐")
+    if 'download_time' in df.columns and not df['download_time'].isna().all():
+        try:
+            last_update = pd.to_datetime(df['download_time'].iloc[0])
+            update_card = dict(title="Last Update", value=last_update.strftime("%H:%M"), subtitle="Today", icon="🕐")
+        except:
+            update_card = dict(title="Last Update", value="Recent", subtitle="Data Fresh", icon="🕐")
+    else:
+        update_card = dict(title="Last Update", value="Recent", subtitle="Data Fresh", icon="🕐")
     
-    with col4:
-        date_range = df['Date'].max() - df['Date'].min()
-        create_metric_card("Date Range", f"{date_range.days}", "Days Coverage", "📅")
+    date_range = df['Date'].max() - df['Date'].min()
     
-    # Add some spacing after metrics
-    st.markdown("<br>", unsafe_allow_html=True)
+    render_metric_grid([
+        dict(title="Stocks Analyzed", value=str(df['symbol'].nunique()), subtitle="Active Symbols", icon="🏢"),
+        dict(title="Data Points", value=f"{len(df):,}", subtitle="Total Records", icon="📊"),
+        update_card,
+        dict(title="Date Range", value=f"{date_range.days}", subtitle="Days Coverage", icon="📅")
+    ], header=section_header("📊", "Market Overview"), footer="<br>")  # spacing after metrics
     
     unique_symbols = cache_symbol_processing(df)
     selected_symbols = create_user_friendly_stock_selection(unique_symbols)
     
-    # Filter data based on selection
-    filtered_df = df[df['symbol'].isin(selected_symbols)] if selected_symbols else df
+    # Filter data based on selection (rows and date bounds cached per selection)
+    filtered_df, first_date, last_date = cache_symbol_selection(df, selected_symbols)
     
     # Date Range Selection
     if not filtered_df.empty:
-        min_date = filtered_df['Date'].min().date()
-        max_date = filtered_df['Date'].max().date()
+        min_date = first_date.date()
+        max_date = last_date.date()
         
         date_range = st.date_input(
             "Select analysis period",
@@ -704,10 +521,7 @@ def main():
         
         if isinstance(date_range, tuple) and len(date_range) == 2:
             start_date, end_date = date_range
-            filtered_df = filtered_df[
-                (filtered_df['Date'] >= pd.to_datetime(start_date)) &
-                (filtered_df['Date'] <= pd.to_datetime(end_date))
-            ]
+            filtered_df = cache_period_selection(filtered_df, selected_symbols, start_date, end_date)
     
     if filtered_df.empty:
         st.warning("No data available for selected stocks and date range.")
@@ -715,95 +529,68 @@ def main():
     
     
     # Generate summary statistics with caching
-    symbols_hash = hash(str(sorted(selected_symbols))) if selected_symbols else 0
-    date_hash = hash(str(date_range)) if 'date_range' in locals() else 0
-    summary = cache_statistics_calculation(filtered_df, symbols_hash, date_hash)
+    symbols_key = tuple(sorted(selected_symbols))
+    date_key = tuple(date_range) if isinstance(date_range, tuple) else ()
+    summary = cache_statistics_calculation(filtered_df, symbols_key, date_key)
+    
+    # Best/worst performers located once (NaN-skipping, like idxmax/idxmin),
+    # shared by the overview cards and the portfolio context
+    portfolio_return = summary['total_return'].mean()
+    if not summary.empty:
+        total_returns = summary['total_return'].to_numpy(dtype=float)
+        best_idx, worst_idx = int(np.nanargmax(total_returns)), int(np.nanargmin(total_returns))
+        best_performer, best_return = summary['symbol'].iat[best_idx], total_returns[best_idx]
+        worst_performer, worst_return = summary['symbol'].iat[worst_idx], total_returns[worst_idx]
+    else:
+        best_performer = worst_performer = None
     
     # Portfolio Overview
     if len(selected_symbols) > 1:
-        st.markdown('<div class="section-header"><span class="section-icon">💼</span><h2>Portfolio Overview</h2></div>', unsafe_allow_html=True)
-        
         # Portfolio metrics with enhanced calculations
-        portfolio_return = summary['total_return'].mean()
         portfolio_risk = summary['avg_custom_risk_score'].mean()
-        best_performer = summary.loc[summary['total_return'].idxmax(), 'symbol']
-        worst_performer = summary.loc[summary['total_return'].idxmin(), 'symbol']
         
-        col1, col2, col3, col4 = st.columns(4)
+        # Dynamic return analysis with intelligent indicators
+        return_icon = "📈" if portfolio_return > 0 else "📉" if portfolio_return < 0 else "➡️"
+        return_magnitude = abs(portfolio_return)
         
-        with col1:
-            # Dynamic return analysis with intelligent indicators
-            return_icon = "📈" if portfolio_return > 0 else "📉" if portfolio_return < 0 else "➡️"
-            return_magnitude = abs(portfolio_return)
-            
-            if return_magnitude > 0.2:  # >20% return
-                return_descriptor = "Excellent" if portfolio_return > 0 else "Major Loss"
-            elif return_magnitude > 0.1:  # >10% return
-                return_descriptor = "Strong" if portfolio_return > 0 else "Heavy Loss"
-            elif return_magnitude > 0.05:  # >5% return
-                return_descriptor = "Good" if portfolio_return > 0 else "Moderate Loss"
-            elif return_magnitude > 0:
-                return_descriptor = "Modest" if portfolio_return > 0 else "Small Loss"
-            else:
-                return_descriptor = "Flat"
-            
-            create_metric_card(
-                "Portfolio Return",
-                f"{portfolio_return:.2%}",
-                return_descriptor,
-                return_icon
-            )
-        
-        with col2:
-            # Intelligent risk assessment
-            if portfolio_risk > 0.15:
-                risk_icon = "🔴"
-                risk_level = "High Risk"
-            elif portfolio_risk > 0.08:
-                risk_icon = "🟡"
-                risk_level = "Moderate"
-            elif portfolio_risk > 0.04:
-                risk_icon = "🟢"
-                risk_level = "Low Risk"
-            else:
-                risk_icon = "🟢"
-                risk_level = "Very Safe"
-                
-            create_metric_card(
-                "Average Risk Score",
-                f"{portfolio_risk:.3f}",
-                risk_level,
-                risk_icon
-            )
+        if return_magnitude > 0.2:  # >20% return
+            return_descriptor = "Excellent" if portfolio_return > 0 else "Major Loss"
+        elif return_magnitude > 0.1:  # >10% return
+            return_descriptor = "Strong" if portfolio_return > 0 else "Heavy Loss"
+        elif return_magnitude > 0.05:  # >5% return
+            return_descriptor = "Good" if portfolio_return > 0 else "Moderate Loss"
+        elif return_magnitude > 0:
+            return_descriptor = "Modest" if portfolio_return > 0 else "Small Loss"
+        else:
+            return_descriptor = "Flat"
         
-        with col3:
-            # Best performer with shorter context
-            best_return = summary.loc[summary['symbol'] == best_performer, 'total_return'].iloc[0]
-            
-            create_metric_card(
-                "Best Performer",
-                best_performer,
-                f"{best_return:.2%} • Top Pick",
-                "🏆"
-            )
+        # Intelligent risk assessment
+        if portfolio_risk > 0.15:
+            risk_icon = "🔴"
+            risk_level = "High Risk"
+        elif portfolio_risk > 0.08:
+            risk_icon = "🟡"
+            risk_level = "Moderate"
+        elif portfolio_risk > 0.04:
+            risk_icon = "🟢"
+            risk_level = "Low Risk"
+        else:
+            risk_icon = "🟢"
+            risk_level = "Very Safe"
         
-        with col4:
-            # Worst performer with shorter context
-            worst_return = summary.loc[summary['symbol'] == worst_performer, 'total_return'].iloc[0]
-            
-            create_metric_card(
-                "Worst Performer",
-                worst_performer,
-                f"{worst_return:.2%} • Review",
-                "⚠️"
-            )
+        render_metric_grid([
+            dict(title="Portfolio Return", value=f"{portfolio_return:.2%}", subtitle=return_descriptor, icon=return_icon),
+            dict(title="Average Risk Score", value=f"{portfolio_risk:.3f}", subtitle=risk_level, icon=risk_icon),
+            dict(title="Best Performer", value=best_performer, subtitle=f"{best_return:.2%} • Top Pick", icon="🏆"),
+            dict(title="Worst Performer", value=worst_performer, subtitle=f"{worst_return:.2%} • Review", icon="⚠️")
+        ], header=section_header("💼", "Portfolio Overview"))
    # Create portfolio context for individual stock analysis
     portfolio_context = {
-        'avg_return': summary['total_return'].mean(),
+        'avg_return': portfolio_return,
         'avg_volatility': summary['volatility_21'].mean() if 'volatility_21' in summary.columns else 0,
         'portfolio_size': len(selected_symbols),
-        'best_performer': summary.loc[summary['total_return'].idxmax(), 'symbol'] if not summary.empty else None,
-        'worst_performer': summary.loc[summary['total_return'].idxmin(), 'symbol'] if not summary.empty else None
+        'best_performer': best_performer,
+        'worst_performer': worst_performer
     }
             
     # Individual Stock Analysis Section
@@ -813,41 +600,39 @@ def main():
     # Analyze ALL selected stocks, sorted by return (best first, but show all)
     all_stocks = summary.sort_values('total_return', ascending=False)
     
-    for _, row in all_stocks.iterrows():
-        # Get comprehensive insights for EVERY stock
-        comprehensive_insights = generate_comprehensive_analysis(row['symbol'], row, portfolio_context)
-        
+    # Get comprehensive insights for EVERY stock, scored in one vectorized pass
+    # (cached: unrelated widget reruns reuse the narratives)
+    all_insights = cache_comprehensive_analysis(all_stocks, symbols_key, date_key, portfolio_context)
+    
+    # Visual indicator for each stock's performance level, picked column-wise
+    returns = all_stocks['total_return'].to_numpy(dtype=float)
+    indicators = np.select(
+        [returns > 0.15, returns > 0.05, returns > 0, returns > -0.10],
+        ["🚀 Strong Performer", "📈 Positive", "📊 Modest Gains", "📉 Declining"],
+        default="⚠️ Significant Decline"
+    )
+    
+    for symbol, return_pct, performance_indicator, comprehensive_insights in zip(
+        all_stocks['symbol'].tolist(), returns.tolist(), indicators.tolist(), all_insights
+    ):
         if comprehensive_insights:
-            # Add a visual indicator for performance level
-            return_pct = row['total_return']
-            if return_pct > 0.15:
-                performance_indicator = "🚀 Strong Performer"
-            elif return_pct > 0.05:
-                performance_indicator = "📈 Positive"
-            elif return_pct > 0:
-                performance_indicator = "📊 Modest Gains"
-            elif return_pct > -0.10:
-                performance_indicator = "📉 Declining"
-            else:
-                performance_indicator = "⚠️ Significant Decline"
-            
-            with st.expander(f"📊 {row['symbol']} - {performance_indicator} ({return_pct:.1%})"):
+            with st.expander(f"📊 {symbol} - {performance_indicator} ({return_pct:.1%})"):
                 for insight in comprehensive_insights:
                     st.markdown(insight)
                     
 # Advanced Analytics Section
-    st.markdown('<div class="section-header"><span class="section-icon">🧠</span><h2>Advanced Market Intelligence</h2></div>', unsafe_allow_html=True)
+    render_section_header("🧠", "Advanced Market Intelligence")
     
     if not summary.empty:
         # Market regime analysis
-        market_insights = generate_market_regime_insights(summary)
+        market_insights = cache_market_regime_insights(summary, symbols_key, date_key)
         if market_insights:
             st.subheader("📊 Market Regime Analysis")
             for insight in market_insights:
                 st.info(insight)
         
         # Portfolio optimization tips
-        portfolio_tips = generate_portfolio_optimization_insights(summary)
+        portfolio_tips = cache_portfolio_optimization_insights(summary, symbols_key, date_key)
         if portfolio_tips:
             st.subheader("🎯 Portfolio Composition Analysis")
             for tip in portfolio_tips:
@@ -856,44 +641,41 @@ def main():
         st.markdown("---")
         
     # Interactive Charts Section
-    st.markdown('<div class="section-header"><span class="section-icon">📊</span><h2>Interactive Analytics</h2></div>', unsafe_allow_html=True)
+    render_section_header("📊", "Interactive Analytics")
     
     # Risk vs Return Scatter Plot
     if not summary.empty:
-        fig = create_risk_return_scatter(summary)
+        fig = cache_risk_return_scatter(summary, symbols_key, date_key)
         st.plotly_chart(fig, use_container_width=True)
     
     # Performance Comparison Chart
     if selected_symbols:
-        perf_fig = create_performance_chart(filtered_df, selected_symbols)
+        perf_fig = cache_performance_chart(filtered_df, selected_symbols, date_key)
         if perf_fig:
             st.plotly_chart(perf_fig, use_container_width=True)
     
     # Metrics Comparison Chart
     if not summary.empty:
-        metrics_fig = create_portfolio_metrics_chart(summary)
+        metrics_fig = cache_portfolio_metrics_chart(summary, symbols_key, date_key)
         st.plotly_chart(metrics_fig, use_container_width=True)
     
     # Correlation Heatmap
     if len(selected_symbols) > 1:
-        corr_fig = create_correlation_heatmap(filtered_df, selected_symbols)
+        corr_fig = cache_correlation_heatmap(filtered_df, selected_symbols, date_key)
         if corr_fig:
             st.plotly_chart(corr_fig, use_container_width=True)
     
     # Data Table Section
-    st.markdown('<div class="section-header"><span class="section-icon">📋</span><h2>Detailed Analysis</h2></div>', unsafe_allow_html=True)
+    render_section_header("📋", "Detailed Analysis")
     
     # Summary table with better formatting
     if not summary.empty:
-        # Format the summary table for better display
-        display_summary = summary.copy()
-        display_summary['total_return'] = display_summary['total_return'].apply(lambda x: f"{x:.2%}" if pd.notna(x) else "N/A")
-        display_summary['avg_daily_return'] = display_summary['avg_daily_return'].apply(lambda x: f"{x:.4%}" if pd.notna(x) else "N/A")
-        display_summary['avg_rolling_yield_21'] = display_summary['avg_rolling_yield_21'].apply(lambda x: f"{x:.4%}" if pd.notna(x) else "N/A")
-        display_summary['volatility_21'] = display_summary['volatility_21'].apply(lambda x: f"{x:.4f}" if pd.notna(x) else "N/A")
-        display_summary['avg_sharpe_21'] = display_summary['avg_sharpe_21'].apply(lambda x: f"{x:.2f}" if pd.notna(x) else "N/A")
-        display_summary['avg_custom_risk_score'] = display_summary['avg_custom_risk_score'].apply(lambda x: f"{x:.4f}" if pd.notna(x) else "N/A")
-        display_summary['avg_close'] = display_summary['avg_close'].apply(lambda x: f"${x:.2f}" if pd.notna(x) else "N/A")
+        # Format the summary table for better display (risk_category is an
+        # internal bucket for the insights, not one of the displayed risk levels)
+        display_summary = summary.drop(columns='risk_category', errors='ignore').assign(**{
+            column: _format_column(summary[column], spec, scale)
+            for column, (spec, scale) in SUMMARY_DISPLAY_FORMATS.items()
+        })
         
         st.dataframe(
             display_summary,
@@ -917,15 +699,21 @@ def main():
         
         with col1:
             st.markdown("**🚀 Highest Returns**")
-            top_returns = summary.nlargest(5, 'total_return')[['symbol', 'total_return']]
-            for _, row in top_returns.iterrows():
-                st.markdown(f"• **{row['symbol']}**: {row['total_return']:.2%}")
+            top_returns = heapq.nlargest(5, (
+                (value, symbol) for value, symbol in zip(summary['total_return'].tolist(), summary['symbol'].tolist())
+                if pd.notna(value)
+            ))
+            for total_return, symbol in top_returns:
+                st.markdown(f"• **{symbol}**: {total_return:.2%}")
         
         with col2:
             st.markdown("**⚡ Best Risk-Adjusted Returns**")
-            top_sharpe = summary.nlargest(5, 'avg_sharpe_21')[['symbol', 'avg_sharpe_21']]
-            for _, row in top_sharpe.iterrows():
-                st.markdown(f"• **{row['symbol']}**: {row['avg_sharpe_21']:.2f}")
+            top_sharpe = heapq.nlargest(5, (
+                (value, symbol) for value, symbol in zip(summary['avg_sharpe_21'].tolist(), summary['symbol'].tolist())
+                if pd.notna(value)
+            ))
+            for sharpe, symbol in top_sharpe:
+                st.markdown(f"• **{symbol}**: {sharpe:.2f}")
 
 if __name__ == "__main__":
     main()
@@ -3,10 +3,25 @@ Constants and Static Data for BullBoard Application
 Contains CSS styling, symbol mappings, and UI constants
 """
 
+import re
+
+
+def _minify_css(markup):
+    """Drop comments and collapse whitespace so each rerun ships a smaller payload"""
+    markup = re.sub(r'/\*.*?\*/', '', markup, flags=re.S)
+    markup = re.sub(r'\s+', ' ', markup)
+    return re.sub(r'\s*([{};])\s*', r'\1', markup).strip()
+
+
+def _minify_html(markup):
+    """Collapse whitespace between tags in a static HTML fragment"""
+    return re.sub(r'>\s+<', '><', re.sub(r'\s+', ' ', markup)).strip()
+
+
 # ==========================================
 # CSS STYLING
 # ==========================================
-CUSTOM_CSS = """
+CUSTOM_CSS = _minify_css("""
 <style>
     /* Import Google Fonts */
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
@@ -150,6 +165,19 @@ CUSTOM_CSS = """
 }
     
 /* Metric Cards - Fixed height and text positioning */
+.metric-grid {
+    display: grid;
+    grid-template-columns: repeat(4, minmax(0, 1fr));
+    gap: 1rem;
+}
+
+/* Stack like st.columns does on narrow screens */
+@media (max-width: 640px) {
+    .metric-grid {
+        grid-template-columns: 1fr;
+    }
+}
+
 .metric-card {
     background: linear-gradient(145deg, #ffffff 0%, #f8fafc 50%, #ffffff 100%);
     border: 1px solid #e2e8f0;
@@ -382,7 +410,215 @@ h1, h2, h3, h4, h5, h6 {
     footer {visibility: hidden;}
     header {visibility: hidden;}
 </style>
-"""
+""")
+
+# Dark starfield theme layered on top of CUSTOM_CSS by the stock selection page
+STARFIELD_CSS = _minify_css("""
+<style>
+.stApp {
+    background: 
+        radial-gradient(2px 2px at 20px 30px, rgba(255,255,255,0.15), transparent),
+        radial-gradient(2px 2px at 40px 70px, rgba(255,255,255,0.1), transparent),
+        radial-gradient(1px 1px at 90px 40px, rgba(255,255,255,0.1), transparent),
+        radial-gradient(1px 1px at 130px 80px, rgba(255,255,255,0.1), transparent),
+        radial-gradient(2px 2px at 160px 30px, rgba(255,255,255,0.1), transparent),
+        linear-gradient(135deg, #0c0c0c 0%, #1a1a2e 15%, #16213e 35%, #0f3460 55%, #533483 75%, #7b2d26 95%, #2c1810 100%) !important;
+    background-size: 
+        200px 100px,
+        300px 120px,
+        150px 200px,
+        250px 150px,
+        180px 90px,
+        100% 100% !important;
+    background-attachment: fixed !important;
+    animation: starfieldMove 25s linear infinite, gradientPulse 15s ease-in-out infinite !important;
+}
+
+@keyframes starfieldMove {
+    0% {
+        background-position: 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0% 50%;
+    }
+    100% {
+        background-position: 200px 100px, -300px 120px, 150px -200px, -250px 150px, 180px -90px, 100% 50%;
+    }
+}
+
+@keyframes gradientPulse {
+    0%, 100% {
+        background-position: 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0% 50%;
+    }
+    50% {
+        background-position: 100px 50px, 150px 60px, 75px 100px, 125px 75px, 90px 45px, 100% 50%;
+    }
+}
+
+/* Enhanced text with subtle glow */
+.stMarkdown, .stText, p, span {
+    color: #f8f9fa !important;
+    text-shadow: 0 0 10px rgba(248, 249, 250, 0.1) !important;
+}
+
+h1, h2, h3, h4, h5, h6 {
+    color: #ffffff !important;
+    text-shadow: 0 0 15px rgba(255, 255, 255, 0.2) !important;
+}
+
+/* Premium button styling with enhanced gradient */
+.stButton > button {
+    background: linear-gradient(45deg, 
+        rgba(123, 45, 38, 0.9) 0%, 
+        rgba(83, 52, 131, 0.9) 25%, 
+        rgba(15, 52, 96, 0.9) 50%, 
+        rgba(83, 52, 131, 0.9) 75%, 
+        rgba(123, 45, 38, 0.9) 100%) !important;
+    background-size: 200% 200% !important;
+    color: white !important;
+    border: 1px solid rgba(255, 255, 255, 0.3) !important;
+    border-radius: 10px !important;
+    font-weight: bold !important;
+    box-shadow: 
+        0 4px 15px rgba(0, 0, 0, 0.3),
+        inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
+    transition: all 0.4s ease !important;
+    animation: buttonShimmer 3s ease-in-out infinite !important;
+}
+
+@keyframes buttonShimmer {
+    0%, 100% {
+        background-position: 0% 50%;
+    }
+    50% {
+        background-position: 100% 50%;
+    }
+}
+
+.stButton > button:hover {
+    background-position: 100% 50% !important;
+    transform: translateY(-2px) scale(1.02) !important;
+    box-shadow: 
+        0 8px 25px rgba(123, 45, 38, 0.4),
+        0 4px 15px rgba(83, 52, 131, 0.3),
+        inset 0 1px 0 rgba(255, 255, 255, 0.2) !important;
+    border-color: rgba(255, 255, 255, 0.5) !important;
+}
+
+/* Sleek input styling with glow effects */
+.stSelectbox > div > div,
+.stTextInput > div > div > input {
+    background: rgba(255, 255, 255, 0.08) !important;
+    border: 1px solid rgba(255, 255, 255, 0.15) !important;
+    border-radius: 10px !important;
+    color: #f8f9fa !important;
+    backdrop-filter: blur(10px) !important;
+    box-shadow: 
+        inset 0 1px 3px rgba(0, 0, 0, 0.2),
+        0 1px 3px rgba(255, 255, 255, 0.1) !important;
+    transition: all 0.3s ease !important;
+}
+
+.stSelectbox > div > div:focus,
+.stTextInput > div > div > input:focus {
+    border-color: rgba(123, 45, 38, 0.7) !important;
+    box-shadow: 
+        0 0 0 3px rgba(123, 45, 38, 0.15),
+        inset 0 1px 3px rgba(0, 0, 0, 0.2),
+        0 1px 8px rgba(123, 45, 38, 0.3) !important;
+    background: rgba(255, 255, 255, 0.12) !important;
+}
+
+/* Enhanced metric containers */
+div[data-testid="metric-container"] {
+    background: rgba(255, 255, 255, 0.05) !important;
+    border: 1px solid rgba(255, 255, 255, 0.1) !important;
+    border-radius: 12px !important;
+    backdrop-filter: blur(15px) !important;
+    box-shadow: 
+        0 8px 32px rgba(0, 0, 0, 0.3),
+        inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
+}
+
+/* Stock basket rows */
+.basket-item {
+    background: rgba(255, 255, 255, 0.95);
+    padding: 10px 15px;
+    border-radius: 10px;
+    color: #2d3436;
+    font-weight: bold;
+    margin: 5px 0;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+    border-left: 4px solid #4facfe;
+}
+
+/* Portfolio size badge; color and border color are set inline */
+.portfolio-status {
+    background: rgba(255, 255, 255, 0.95);
+    padding: 15px;
+    border-radius: 12px;
+    text-align: center;
+    font-weight: bold;
+    margin: 15px 0;
+    box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+    border: 2px solid;
+}
+</style>
+""")
+
+# ==========================================
+# STATIC HTML
+# ==========================================
+# Metric card markup, filled with str.format_map(title=, value=, subtitle=, icon=)
+METRIC_CARD_TEMPLATE = _minify_html("""
+<div class="metric-card">
+    <div class="metric-header">
+        <span class="metric-icon">{icon}</span>
+        <span class="metric-title">{title}</span>
+    </div>
+    <div class="metric-value">{value}</div>
+    <div class="metric-subtitle">{subtitle}</div>
+</div>
+""")
+
+# Section title bar, filled with str.format(icon=, title=)
+SECTION_HEADER_TEMPLATE = '<div class="section-header"><span class="section-icon">{icon}</span><h2>{title}</h2></div>'
+
+# Stock basket rows and size badge, filled per rerun
+BASKET_ITEM_TEMPLATE = '<div class="basket-item">{symbol} - {name}</div>'
+PORTFOLIO_STATUS_TEMPLATE = _minify_html("""
+<div class="portfolio-status" style="color: {color}; border-color: {color};">
+    {emoji} {size} stocks selected - {text}
+</div>
+""")
+
+HEADER_HTML = _minify_html("""
+<div class="main-header">
+    <div class="header-content">
+        <div class="logo-section">
+            <span class="logo-icon">🐂</span>
+            <div class="logo-text">
+                <h1>BullBoard</h1>
+                <div class="tagline">Professional Stock Analysis Made Simple</div>
+            </div>
+        </div>
+        <div class="value-props">
+            <div class="prop-item">
+                <span class="prop-icon">📊</span>
+                <span class="prop-text">Objective Data</span>
+            </div>
+            <div class="prop-item">
+                <span class="prop-icon">🎯</span>
+                <span class="prop-text">Clear Insights</span>
+            </div>
+            <div class="prop-item">
+                <span class="prop-icon">⚡</span>
+                <span class="prop-text">Real-time Analysis</span>
+            </div>
+        </div>
+    </div>
+    <div class="header-subtitle">
+        Objective insights for informed decision-making • No advice, just facts
+    </div>
+</div>
+""")
 
 # ==========================================
 # STOCK SYMBOL MAPPINGS  
@@ -918,6 +1154,12 @@ SYMBOL_TO_NAME_MAPPING = {
         'ZTS': 'Zoetis Inc.'
     }
 
+# Basket labels (names cut to 25 characters), built once at import
+SYMBOL_TO_DISPLAY_NAME = {
+    symbol: name[:25] + '...' if len(name) > 25 else name
+    for symbol, name in SYMBOL_TO_NAME_MAPPING.items()
+}
+
 
 # ==========================================
 # SECTOR MAPPINGS
@@ -935,6 +1177,9 @@ SECTOR_MAPPING = {
         'Real Estate': ['AMT', 'CCI', 'PLD', 'EQIX', 'PSA', 'EXR', 'AVB', 'EQR', 'WELL', 'SPG']
     }
 
+# Reverse lookup, built once at import
+SYMBOL_TO_SECTOR = {symbol: sector for sector, symbols in SECTOR_MAPPING.items() for symbol in symbols}
+
 
 # ==========================================
 # QUICK CATEGORY MAPPINGS
@@ -42,6 +42,9 @@ PERFORMANCE_CHART_HEIGHT = 400
 CORRELATION_HEATMAP_HEIGHT = 500
 METRICS_CHART_HEIGHT = 400
 
+# Line charts are downsampled (LTTB) to at most this many points per trace
+MAX_POINTS_PER_TRACE = 800
+
 # Color schemes
 CHART_COLOR_SCHEME = 'RdYlGn'
 DEFAULT_CHART_COLORS = ['#e74c3c', '#2ecc71', '#3498db']
@@ -6,12 +6,22 @@ Handles data loading, validation, and statistical calculations
 from .processor import (
     load_and_validate_data,
     get_processed_symbols,
+    get_sector_mapping,
+    get_available_symbols,
+    get_symbol_search_index,
+    get_symbol_row_index,
+    select_symbol_rows,
+    select_date_range,
     calculate_summary_statistics
 )
 
 from .cache_manager import (
     cache_data_loading,
     cache_symbol_processing,
+    cache_symbol_search_index,
+    cache_symbol_row_index,
+    cache_symbol_selection,
+    cache_period_selection,
     cache_statistics_calculation
 )
 
@@ -20,8 +30,18 @@ __version__ = "1.0.0"
 __all__ = [
     'load_and_validate_data',
     'get_processed_symbols', 
+    'get_sector_mapping',
+    'get_available_symbols',
+    'get_symbol_search_index',
+    'get_symbol_row_index',
+    'select_symbol_rows',
+    'select_date_range',
     'calculate_summary_statistics',
     'cache_data_loading',
     'cache_symbol_processing',
+    'cache_symbol_search_index',
+    'cache_symbol_row_index',
+    'cache_symbol_selection',
+    'cache_period_selection',
     'cache_statistics_calculation'
 ]
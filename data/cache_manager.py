@@ -3,27 +3,112 @@ Cache Management Module
 Handles Streamlit caching for data operations
 """
 
+import os
+
 import streamlit as st
 from .processor import (
     load_and_validate_data as _load_and_validate_data,
     get_processed_symbols as _get_processed_symbols,
+    get_symbol_search_index as _get_symbol_search_index,
+    get_symbol_row_index as _get_symbol_row_index,
+    select_symbol_rows as _select_symbol_rows,
+    select_date_range as _select_date_range,
     calculate_summary_statistics as _calculate_summary_statistics
 )
 
 
-@st.cache_data
-def cache_data_loading():
-    """Cached wrapper for data loading"""
+def _results_file_signature(path="latest_results.csv"):
+    """(mtime_ns, size) of the results file, or None while it doesn't exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _cached_data_loading(file_signature):
+    """Data load memoized per results-file version (the signature is only a cache key)
+    
+    A shared resource rather than cache_data, so reruns skip the pickle round
+    trip of the whole frame: callers must treat it as read-only and filter into
+    new frames.
+    """
     return _load_and_validate_data()
 
 
+def cache_data_loading():
+    """Cached wrapper for data loading, reloaded when the ETL rewrites the file"""
+    return _cached_data_loading(_results_file_signature())
+
+
 @st.cache_data
+def _cached_symbol_processing(_df, file_signature):
+    """Symbol list memoized per results-file version (the frame itself is not hashed)"""
+    return _get_processed_symbols(_df)
+
+
 def cache_symbol_processing(_df):
     """Cached wrapper for symbol processing"""
-    return _get_processed_symbols(_df)
+    return _cached_symbol_processing(_df, _results_file_signature())
+
+
+@st.cache_resource
+def cache_symbol_search_index(unique_symbols):
+    """Cached search table per symbol universe (shared, not copied: callers only read it)"""
+    return _get_symbol_search_index(unique_symbols)
+
+
+@st.cache_resource(max_entries=1)
+def _cached_symbol_row_index(_df, file_signature):
+    """Row index memoized per results-file version (the frame itself is not hashed)"""
+    return _get_symbol_row_index(_df)
+
+
+def cache_symbol_row_index(_df):
+    """Cached symbol -> row positions map (shared, not copied: callers only read it)
+    
+    Keyed on the same file version as the cached frame, so a reload rebuilds it.
+    """
+    return _cached_symbol_row_index(_df, _results_file_signature())
+
+
+@st.cache_resource(max_entries=16)
+def _cached_symbol_selection(_df, symbols, file_signature):
+    """Selected symbols' rows and their first/last date, memoized per file version"""
+    if symbols:
+        rows = _select_symbol_rows(_df, _cached_symbol_row_index(_df, file_signature), symbols)
+    else:
+        rows = _df
+    return rows, rows['Date'].min(), rows['Date'].max()
+
+
+def cache_symbol_selection(_df, symbols):
+    """Cached (rows, min_date, max_date) for the selected symbols (shared: read-only)"""
+    return _cached_symbol_selection(_df, tuple(symbols), _results_file_signature())
+
+
+@st.cache_resource(max_entries=16)
+def _cached_period_selection(_rows, symbols, start_date, end_date, file_signature):
+    """Date-window slice of a cached symbol selection, memoized on what produced it"""
+    return _select_date_range(_rows, start_date, end_date)
+
+
+def cache_period_selection(_rows, symbols, start_date, end_date):
+    """Cached date-window slice of cache_symbol_selection's rows (shared: read-only)"""
+    return _cached_period_selection(_rows, tuple(symbols), start_date, end_date, _results_file_signature())
 
 
 @st.cache_data
-def cache_statistics_calculation(_filtered_df, selected_symbols_hash, date_hash):
-    """Cached wrapper for statistics calculation"""
-    return _calculate_summary_statistics(_filtered_df, selected_symbols_hash, date_hash)
+def _cached_statistics_calculation(_filtered_df, symbols_key, date_key, file_signature):
+    """Summary memoized on what produced the filtered frame (the frame itself is not hashed)"""
+    return _calculate_summary_statistics(_filtered_df, symbols_key, date_key)
+
+
+def cache_statistics_calculation(_filtered_df, symbols_key, date_key):
+    """Cached wrapper for statistics calculation
+    
+    Keys are plain tuples (Streamlit hashes them directly) plus the results
+    file version, so a data refresh recomputes the summary.
+    """
+    return _cached_statistics_calculation(_filtered_df, symbols_key, date_key, _results_file_signature())
@@ -8,6 +8,42 @@ import numpy as np
 import os
 import traceback
 from config.settings import MIN_DAYS_NEEDED
+from config.constants import SECTOR_MAPPING, SYMBOL_TO_SECTOR, SYMBOL_TO_NAME_MAPPING
+
+# Risk-score buckets attached to the summary once, at load time
+RISK_SCORE_BINS = [-np.inf, 0.05, 0.08, np.inf]
+RISK_SCORE_LABELS = ['low', 'moderate', 'high']
+
+# Results-file columns the app reads; the ETL's raw OHLCV extras are skipped at parse time
+LOADED_COLUMNS = frozenset({
+    'symbol', 'Date', 'Close', 'daily_return', 'volatility_21', 'rolling_yield_21',
+    'sharpe_21', 'max_drawdown_63', 'custom_risk_score', 'download_time'
+})
+
+
+def _read_results_parquet():
+    """LOADED_COLUMNS from the ETL's Parquet sidecar, or None when it can't be used
+    
+    The sidecar is written right after the CSV, so it is only trusted when it
+    is at least as new as the CSV it mirrors.
+    """
+    if not os.path.exists("latest_results.parquet"):
+        return None
+    if os.path.getmtime("latest_results.parquet") < os.path.getmtime("latest_results.csv"):
+        return None
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    
+    # Typed and columnar: no tokenizing or date parsing, only the needed columns read.
+    # A truncated or corrupt sidecar must not hide the valid CSV next to it
+    try:
+        columns = [column for column in pq.read_schema("latest_results.parquet").names if column in LOADED_COLUMNS]
+        return pd.read_parquet("latest_results.parquet", engine="pyarrow", columns=columns)
+    except Exception as e:
+        print(f"⚠️ Unreadable Parquet sidecar, loading the CSV: {e}")
+        return None
 
 
 def load_and_validate_data():
@@ -20,7 +56,20 @@ def load_and_validate_data():
             return None
             
         print("📂 File found, loading...")
-        df = pd.read_csv("latest_results.csv")
+        df = _read_results_parquet()
+        if df is None:
+            # Header-only read: the pyarrow engine needs usecols as a list of present columns
+            header = pd.read_csv("latest_results.csv", nrows=0).columns
+            usecols = [column for column in header if column in LOADED_COLUMNS]
+            try:
+                # Arrow's multithreaded reader parses Date (and download_time) while tokenizing
+                df = pd.read_csv("latest_results.csv", engine="pyarrow", usecols=usecols, parse_dates=["Date"])
+            except ImportError:
+                df = pd.read_csv("latest_results.csv", usecols=usecols, parse_dates=["Date"])
+        
+        # Integer codes: symbol isin/groupby/nunique skip per-row string hashing
+        if 'symbol' in df.columns:
+            df['symbol'] = df['symbol'].astype('category')
         print(f"✅ Loaded: {df.shape}")
         
         if df.empty:
@@ -35,27 +84,93 @@ def load_and_validate_data():
         return None
 
 def get_processed_symbols(df):
-    """Cache symbol processing"""
-    return sorted(df['symbol'].unique())
+    """Sorted symbol universe as a tuple (hashable, so it keys the caches as is)"""
+    # The categorical's categories are already the sorted distinct symbols: no row scan
+    return tuple(df['symbol'].cat.categories)
+
+
+def get_sector_mapping(unique_symbols):
+    """Sector -> symbols map, plus an 'Other' sector for symbols no sector lists"""
+    # Set difference in C; sorted to match the (sorted) symbol universe
+    other_symbols = sorted(set(unique_symbols) - SYMBOL_TO_SECTOR.keys())
+    if not other_symbols:
+        return SECTOR_MAPPING
+    
+    # Extend a copy, so the shared constant isn't mutated
+    return {**SECTOR_MAPPING, 'Other': other_symbols}
 
 
-def calculate_summary_statistics(filtered_df, selected_symbols_hash, date_hash):
+def get_available_symbols(selected_sectors, unique_symbols):
+    """Sorted loaded symbols belonging to any of the selected sectors"""
+    sector_mapping = get_sector_mapping(unique_symbols)
+    filtered_symbols = set()
+    for sector in selected_sectors:
+        if sector in sector_mapping:
+            filtered_symbols.update(sector_mapping[sector])
+    
+    # Dedupe, keep only loaded symbols and sort in one step (hashed, not a list scan)
+    return sorted(filtered_symbols.intersection(unique_symbols))
+
+
+def get_symbol_search_index(unique_symbols):
+    """Symbol, company name and a lowercased 'symbol\\0name' haystack per symbol
+    
+    One vectorized str.contains over the haystack matches either field; the
+    NUL separator keeps a query from matching across the two.
+    """
+    names = [SYMBOL_TO_NAME_MAPPING.get(symbol, symbol) for symbol in unique_symbols]
+    haystack = [f"{symbol}\0{name}".lower() for symbol, name in zip(unique_symbols, names)]
+    return pd.DataFrame({'symbol': unique_symbols, 'name': names, 'haystack': haystack})
+
+
+def get_symbol_row_index(df):
+    """Map each symbol to the row positions it occupies (one hash-grouping pass)"""
+    return df.groupby('symbol', sort=False, observed=True).indices
+
+
+def select_symbol_rows(df, symbol_rows, symbols):
+    """Rows of df for the given symbols via precomputed positions, in original row order"""
+    positions = [symbol_rows[symbol] for symbol in symbols if symbol in symbol_rows]
+    if not positions:
+        return df.iloc[:0]
+    return df.iloc[np.sort(np.concatenate(positions))]
+
+
+def select_date_range(df, start_date, end_date):
+    """Rows of df dated within [start_date, end_date] (inclusive)"""
+    dates = df['Date']
+    return df[(dates >= pd.Timestamp(start_date)) & (dates <= pd.Timestamp(end_date))]
+
+
+def calculate_summary_statistics(filtered_df, symbols_key, date_key):
     """Cache expensive summary calculations"""
-    return (
-        filtered_df
-        .groupby("symbol")
-        .agg(
-            period_start=("Date", "min"),
-            period_end=("Date", "max"),
-            period_days=("Date", "count"),
-            avg_close=("Close", "mean"),
-            avg_daily_return=("daily_return", "mean"),
-            total_return=("Close", lambda x: (x.iloc[-1] / x.iloc[0]) - 1 if len(x) > 1 and x.iloc[0] != 0 else np.nan),
-            volatility_21=("volatility_21", "mean"),
-            avg_rolling_yield_21=("rolling_yield_21", "mean"),
-            avg_sharpe_21=("sharpe_21", "mean"),
-            avg_max_drawdown_63=("max_drawdown_63", "mean"),
-            avg_custom_risk_score=("custom_risk_score", "mean"),
-        )
-        .reset_index()
+    grouped = filtered_df.groupby("symbol", observed=True)
+    summary = grouped.agg(
+        period_start=("Date", "min"),
+        period_end=("Date", "max"),
+        period_days=("Date", "count"),
+        avg_close=("Close", "mean"),
+        avg_daily_return=("daily_return", "mean"),
+        volatility_21=("volatility_21", "mean"),
+        avg_rolling_yield_21=("rolling_yield_21", "mean"),
+        avg_sharpe_21=("sharpe_21", "mean"),
+        avg_max_drawdown_63=("max_drawdown_63", "mean"),
+        avg_custom_risk_score=("custom_risk_score", "mean"),
     )
+    
+    # Last/first close per symbol via the C aggregations (positional, NaNs kept,
+    # like iloc) instead of a Python lambda per group
+    first_close = grouped["Close"].first(skipna=False).to_numpy()
+    last_close = grouped["Close"].last(skipna=False).to_numpy()
+    valid = (grouped.size().to_numpy() > 1) & (first_close != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total_return = np.where(valid, last_close / first_close - 1, np.nan)
+    summary.insert(summary.columns.get_loc("avg_daily_return") + 1, "total_return", total_return)
+    summary = summary.reset_index()
+    
+    # Categorical, so downstream insight passes compare int8 codes
+    summary['risk_category'] = pd.cut(
+        summary['avg_custom_risk_score'], bins=RISK_SCORE_BINS, labels=RISK_SCORE_LABELS
+    )
+    
+    return summary
@@ -294,6 +294,20 @@ def main():
         print(f"❌ Failed to save output CSV: {e}")
         print(traceback.format_exc())
     
+    # Parquet sidecar for the app: typed and columnar, so loading skips CSV parsing.
+    # Written after the CSV; the app falls back to the CSV when this is missing or older.
+    # Written to a temp file and swapped in, so a failed write never leaves a fresh-looking partial file
+    parquet_path = "latest_results.parquet"
+    temp_path = parquet_path + ".tmp"
+    try:
+        df.to_parquet(temp_path, engine="pyarrow", compression="zstd", index=False)
+        os.replace(temp_path, parquet_path)
+        print("✅ Parquet sidecar saved. File size:", os.path.getsize(parquet_path), "bytes")
+    except Exception as e:
+        print(f"⚠️ Skipped Parquet sidecar: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    
     # Show files in directory so you know file is truly there
     print("Files in cwd:", os.listdir(os.getcwd()))
 
@@ -7,7 +7,11 @@ from .charts import (
     create_risk_return_scatter,
     create_performance_chart,
     create_portfolio_metrics_chart,
-    create_correlation_heatmap
+    create_correlation_heatmap,
+    cache_risk_return_scatter,
+    cache_performance_chart,
+    cache_portfolio_metrics_chart,
+    cache_correlation_heatmap
 )
 
 __version__ = "1.0.0"
@@ -16,5 +20,9 @@ __all__ = [
     'create_risk_return_scatter',
     'create_performance_chart',
     'create_portfolio_metrics_chart',
-    'create_correlation_heatmap'
+    'create_correlation_heatmap',
+    'cache_risk_return_scatter',
+    'cache_performance_chart',
+    'cache_portfolio_metrics_chart',
+    'cache_correlation_heatmap'
 ]
@@ -4,14 +4,18 @@ Interactive visualizations using Plotly for stock and portfolio analysis
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from analysis.portfolio_analyzer import _top_k_indices
+from data.cache_manager import _results_file_signature
 from config.settings import (
     CHART_HEIGHT,
     PERFORMANCE_CHART_HEIGHT,
     CORRELATION_HEATMAP_HEIGHT,
+    MAX_POINTS_PER_TRACE,
     CHART_COLOR_SCHEME,
     DEFAULT_CHART_COLORS,
     CHART_BACKGROUND_COLOR,
@@ -32,20 +36,29 @@ def create_risk_return_scatter(summary):
         st.warning("No valid data available for risk-return analysis.")
         return None
     
-    fig = px.scatter(
-        clean_summary,
-        x='avg_custom_risk_score',
-        y='avg_rolling_yield_21',
-        size=abs(clean_summary['total_return']) + 0.01,  # Ensure no zero/negative sizes
-        color='total_return',
-        hover_name='symbol',
+    # Bubble area tracks |total return|, scaled like plotly.express (20px max)
+    size = clean_summary['total_return'].abs().to_numpy() + 0.01  # Ensure no zero/negative sizes
+    fig = go.Figure(go.Scattergl(  # WebGL: large universes stay responsive
+        x=clean_summary['avg_custom_risk_score'].to_numpy(),
+        y=clean_summary['avg_rolling_yield_21'].to_numpy(),
+        mode='markers',
+        hovertext=clean_summary['symbol'].to_numpy(),
+        hovertemplate='<b>%{hovertext}</b><br><br>Risk Score=%{x}<br>Average Return=%{y}<br>Total Return=%{marker.color}<extra></extra>',
+        marker=dict(
+            size=size,
+            sizemode='area',
+            sizeref=size.max() / 20 ** 2,
+            color=clean_summary['total_return'].to_numpy(),
+            colorscale=CHART_COLOR_SCHEME,
+            colorbar=dict(title='Total Return')
+        ),
+        showlegend=False
+    ))
+    
+    fig.update_layout(
         title="Risk vs Return Analysis",
-        labels={
-            'avg_custom_risk_score': 'Risk Score',
-            'avg_rolling_yield_21': 'Average Return',
-            'total_return': 'Total Return'
-        },
-        color_continuous_scale=CHART_COLOR_SCHEME
+        xaxis_title='Risk Score',
+        yaxis_title='Average Return'
     )
     
     fig.update_layout(
@@ -57,33 +70,88 @@ def create_risk_return_scatter(summary):
     return fig
 
 
+def _lttb_indices(x, y, n_out):
+    """Positions kept by Largest-Triangle-Three-Buckets downsampling of one series
+    
+    The first and last points are always kept; each bucket in between keeps
+    the point forming the largest triangle with the previously kept point and
+    the next bucket's average, which preserves peaks and troughs.
+    """
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < n_out - 1:
+            cx, cy = x[hi:edges[i + 2]].mean(), y[hi:edges[i + 2]].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        keep[i + 1] = a
+    
+    return keep
+
+
 def create_performance_chart(filtered_df, selected_symbols):
     """Create normalized performance comparison chart"""
     if len(selected_symbols) == 0:
         return None
     
-    # Calculate normalized performance
-    perf_data = []
-    for symbol in selected_symbols:
-        symbol_data = filtered_df[filtered_df['symbol'] == symbol].sort_values('Date')
-        if not symbol_data.empty:
-            symbol_data = symbol_data.copy()
-            symbol_data['normalized'] = symbol_data['Close'] / symbol_data['Close'].iloc[0] * 100
-            perf_data.append(symbol_data[['Date', 'normalized', 'symbol']])
-    
-    if not perf_data:
+    # Normalize every selected symbol in one pass over raw arrays, keeping the
+    # selection order; the plotting frame is assembled once at the end
+    symbol_order = {symbol: i for i, symbol in enumerate(selected_symbols)}
+    rows = filtered_df['symbol'].isin(selected_symbols).to_numpy()
+    if not rows.any():
         return None
     
-    combined_data = pd.concat(perf_data)
+    symbols = filtered_df['symbol'].to_numpy()[rows]
+    dates = filtered_df['Date'].to_numpy()[rows]
+    close = filtered_df['Close'].to_numpy(dtype=float)[rows]
     
-    fig = px.line(
-        combined_data,
-        x='Date',
-        y='normalized',
-        color='symbol',
-        title="Normalized Performance Comparison (Base 100)",
-        color_discrete_sequence=px.colors.qualitative.Set1
-    )
+    # Stable two-key sort: by Date, then by selection order
+    order = np.fromiter((symbol_order[symbol] for symbol in symbols), dtype=np.int64, count=symbols.size)
+    position = np.argsort(dates, kind='stable')
+    position = position[np.argsort(order[position], kind='stable')]
+    symbols, dates, close, order = symbols[position], dates[position], close[position], order[position]
+    
+    # Rows are grouped by symbol now, so each run's first Close is its base
+    # (taken positionally: groupby 'first' would skip a leading NaN)
+    starts = np.flatnonzero(np.r_[True, order[1:] != order[:-1]])
+    stops = np.r_[starts[1:], order.size]
+    normalized = close / np.repeat(close[starts], stops - starts) * 100
+    
+    # Bound the points per trace so long date ranges stay responsive in the browser
+    if (stops - starts).max() > MAX_POINTS_PER_TRACE:
+        days = pd.to_datetime(dates).to_numpy(dtype='datetime64[ns]').astype(np.int64) / 86_400e9
+        keep = np.concatenate([
+            start + _lttb_indices(days[start:stop], normalized[start:stop], MAX_POINTS_PER_TRACE)
+            for start, stop in zip(starts, stops)
+        ])
+        symbols, dates, normalized = symbols[keep], dates[keep], normalized[keep]
+        lengths = np.minimum(stops - starts, MAX_POINTS_PER_TRACE)
+        stops = np.cumsum(lengths)
+        starts = stops - lengths
+    
+    # One WebGL line per symbol, coloured in selection order
+    colors = px.colors.qualitative.Set1
+    fig = go.Figure([
+        go.Scattergl(
+            x=dates[start:stop],
+            y=normalized[start:stop],
+            mode='lines',
+            name=symbols[start],
+            line=dict(color=colors[i % len(colors)])
+        )
+        for i, (start, stop) in enumerate(zip(starts.tolist(), stops.tolist()))
+    ])
     
     fig.update_layout(
         title={
@@ -98,7 +166,8 @@ def create_performance_chart(filtered_df, selected_symbols):
         plot_bgcolor=CHART_BACKGROUND_COLOR,
         paper_bgcolor=CHART_PAPER_BACKGROUND,
         height=PERFORMANCE_CHART_HEIGHT,
-        hovermode='x unified'
+        hovermode='x unified',
+        legend_title_text='symbol'
     )
     
     fig.update_xaxes(gridcolor='lightgray', gridwidth=0.5)
@@ -120,13 +189,16 @@ def create_portfolio_metrics_chart(summary):
     
     colors = DEFAULT_CHART_COLORS
     
+    # Column-local top-5 per metric: no row copies of the summary
+    symbols = summary['symbol'].to_numpy()
     for i, (metric, name, color) in enumerate(zip(metrics, metric_names, colors)):
-        top_5 = summary.nlargest(5, metric)
+        values = summary[metric].to_numpy(dtype=float)
+        top_5 = _top_k_indices(values, 5)
         
         fig.add_trace(
             go.Bar(
-                x=top_5['symbol'],
-                y=top_5[metric],
+                x=symbols[top_5],
+                y=values[top_5],
                 name=name,
                 marker_color=color,
                 showlegend=False
@@ -155,21 +227,21 @@ def create_correlation_heatmap(filtered_df, selected_symbols):
     if len(selected_symbols) < 2:
         return None
     
-    # Pivot data to get returns for each stock
-    pivot_data = filtered_df.pivot(index='Date', columns='symbol', values='daily_return')
+    # Pivot only the selected symbols' returns, then correlate the raw matrix
+    selected = filtered_df.loc[filtered_df['symbol'].isin(selected_symbols), ['Date', 'symbol', 'daily_return']]
+    pivot_data = selected.pivot(index='Date', columns='symbol', values='daily_return')
     pivot_data = pivot_data[selected_symbols].dropna()
     
     if pivot_data.empty:
         return None
     
-    correlation_matrix = pivot_data.corr()
+    # Constant series have no defined correlation; leave them NaN like DataFrame.corr()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = np.corrcoef(pivot_data.to_numpy(dtype=float), rowvar=False)
+    labels = pivot_data.columns.tolist()
     
-    fig = px.imshow(
-        correlation_matrix,
-        title="Stock Correlation Matrix",
-        color_continuous_scale='RdBu',
-        aspect='auto'
-    )
+    fig = go.Figure(go.Heatmap(z=correlation, x=labels, y=labels, colorscale='RdBu'))
+    fig.update_yaxes(autorange='reversed')  # Matrix orientation, first symbol on top
     
     fig.update_layout(
         title={
@@ -183,3 +255,47 @@ def create_correlation_heatmap(filtered_df, selected_symbols):
     )
     
     return fig
+
+
+@st.cache_data
+def _cached_risk_return_scatter(_summary, symbols_key, date_key, file_signature):
+    """Risk/return figure memoized on what produced the summary"""
+    return create_risk_return_scatter(_summary)
+
+
+def cache_risk_return_scatter(_summary, symbols_key, date_key):
+    """Cached risk vs return scatter, keyed like cache_statistics_calculation"""
+    return _cached_risk_return_scatter(_summary, symbols_key, date_key, _results_file_signature())
+
+
+@st.cache_data
+def _cached_portfolio_metrics_chart(_summary, symbols_key, date_key, file_signature):
+    """Top-5 metrics figure memoized on what produced the summary"""
+    return create_portfolio_metrics_chart(_summary)
+
+
+def cache_portfolio_metrics_chart(_summary, symbols_key, date_key):
+    """Cached top-5 metrics chart, keyed like cache_statistics_calculation"""
+    return _cached_portfolio_metrics_chart(_summary, symbols_key, date_key, _results_file_signature())
+
+
+@st.cache_data
+def _cached_performance_chart(_filtered_df, selected_symbols, date_key, file_signature):
+    """Performance figure memoized on what produced the filtered frame"""
+    return create_performance_chart(_filtered_df, list(selected_symbols))
+
+
+def cache_performance_chart(_filtered_df, selected_symbols, date_key):
+    """Cached performance chart (keyed on the selection order, which sets trace order)"""
+    return _cached_performance_chart(_filtered_df, tuple(selected_symbols), date_key, _results_file_signature())
+
+
+@st.cache_data
+def _cached_correlation_heatmap(_filtered_df, selected_symbols, date_key, file_signature):
+    """Correlation figure memoized on what produced the filtered frame"""
+    return create_correlation_heatmap(_filtered_df, list(selected_symbols))
+
+
+def cache_correlation_heatmap(_filtered_df, selected_symbols, date_key):
+    """Cached correlation heatmap (keyed on the selection order, which sets axis order)"""
+    return _cached_correlation_heatmap(_filtered_df, tuple(selected_symbols), date_key, _results_file_signature())